@@ -1,89 +1,394 @@
 # agent.py - Headline Scoring and Deduplication Logic
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-#import numpy as np
+from bisect import bisect_right
+from collections import Counter, defaultdict
+import logging
+import os
+import re
+import threading
+import joblib
+import numpy as np
+from scipy import sparse
+
+from features import text_features
+
+logger = logging.getLogger(__name__)
 
 keywords = ["breaking", "trending", "just in", "alert", "hot take", "exclusive"]
 important_entities = ["elon", "ai", "india", "musk", "china", "usa", "bitcoin", "usa"]
 
 def score_headline(title, upvotes=None, comments=None, views=None):
-    score = 0
-    title_lower = title.lower()
-
-    # Keyword scoring
-    for word in keywords:
-        if word in title_lower:
-            score += 10
+    score, _ = keyword_matcher.analyze(title)
 
-    # Length scoring
-    title_length = len(title)
-    if title_length > 80:
-        score += 3
-    elif title_length < 30:
-        score -= 2  # Very short titles often lack context
-
-    # Entity scoring
-    for entity in important_entities:
-        if entity in title_lower:
-            score += 5
+    # Engagement scoring
+    score += engagement_score(upvotes, comments, views)
 
-    # Question bonus
-    if title.endswith('?'):
-        score += 2
+    return score
 
-    # Engagement scoring
+def engagement_score(upvotes=None, comments=None, views=None):
+    """The part of score_headline that changes as a story gathers votes."""
+    score = 0
     if upvotes:
         score += min(upvotes // 50, 10)
     if comments:
         score += min(comments // 10, 5)
     if views:
         score += min(views // 1000, 5)
-
     return score
 
+# --- Deduplication ---
+# Exact pair search is also exact (recall 1.0), so LSH only takes over past the
+# measured crossover. benchmarks/bench_dedup.py, exact vs LSH pairs on the same
+# matrix: 0.01s vs 0.05s at 2k, 0.06s vs 0.21s at 10k, 0.34s vs 0.46s at 20k,
+# 0.74s vs 0.73s at 30k, 1.34s vs 0.91s at 40k, 1.77s vs 1.34s at 50k.
+LSH_MIN_ROWS = 30_000
+MINHASH_PERMUTATIONS = 120
+LSH_BANDS = 40  # 3 rows per band: ~93% recall at Jaccard 0.4, >99% from 0.5
+LSH_SEED = 1337
+VERIFY_CHUNK = 200_000  # Candidate pairs verified per sparse product
+
+def exact_similar_pairs(tfidf, threshold):
+    """All (i, j) with i < j and cosine(i, j) > threshold, from a sparse self-product."""
+    sim = (tfidf @ tfidf.T).tocoo()
+    mask = (sim.row < sim.col) & (sim.data > threshold)
+    return sim.row[mask], sim.col[mask]
+
+def minhash_signatures(tfidf, num_perm=MINHASH_PERMUTATIONS, seed=LSH_SEED, chunk_rows=10_000):
+    """MinHash each row's token set (its non-zero TF-IDF columns)."""
+    # Multiply-shift hashes of the column ids, so the cost follows the
+    # non-zeros rather than the (hashed, very wide) feature space
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((tfidf.shape[0], num_perm), dtype=np.uint32)
+    for start in range(0, tfidf.shape[0], chunk_rows):
+        chunk = tfidf[start:start + chunk_rows]
+        columns, positions = np.unique(chunk.indices, return_inverse=True)
+        column_hashes = (columns.astype(np.uint64)[:, None] * multipliers + offsets) >> np.uint64(32)
+        hashed = column_hashes.astype(np.uint32)[positions]
+        # Caller drops empty rows, so every row owns at least one entry
+        signatures[start:start + chunk.shape[0]] = np.minimum.reduceat(hashed, chunk.indptr[:-1], axis=0)
+    return signatures
+
+def lsh_candidate_pairs(signatures, bands=LSH_BANDS):
+    """Row pairs that share at least one identical band of their signatures."""
+    n = signatures.shape[0]
+    rows_per_band = signatures.shape[1] // bands
+    pairs = []
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+        keys = block[:, 0]
+        for col in range(1, rows_per_band):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) + block[:, col]
+
+        # Sort so each bucket is a contiguous run, then pair every run member
+        # with the ones 1, 2, ... positions after it until no run is that long
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bucket = np.cumsum(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        for offset in range(1, len(order)):
+            same = bucket[offset:] == bucket[:-offset]
+            if not same.any():
+                break
+            a, b = order[:-offset][same], order[offset:][same]
+            pairs.append(np.minimum(a, b) * n + np.maximum(a, b))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    codes = np.unique(np.concatenate(pairs))
+    return np.stack([codes // n, codes % n], axis=1)
+
+def lsh_similar_pairs(tfidf, threshold):
+    """Like exact_similar_pairs, but only scores MinHash/LSH candidate pairs."""
+    nonempty = np.flatnonzero(np.diff(tfidf.indptr))
+    candidates = lsh_candidate_pairs(minhash_signatures(tfidf[nonempty]))
+    if not len(candidates):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    left, right = nonempty[candidates[:, 0]], nonempty[candidates[:, 1]]
+
+    keep = np.zeros(len(left), dtype=bool)
+    for start in range(0, len(left), VERIFY_CHUNK):
+        end = start + VERIFY_CHUNK
+        sims = np.asarray(tfidf[left[start:end]].multiply(tfidf[right[start:end]]).sum(axis=1)).ravel()
+        keep[start:end] = sims > threshold
+    return left[keep], right[keep]
+
 def deduplicate_headlines(headlines, threshold=0.7):
-    titles = [h['title'] for h in headlines]
-    tfidf = TfidfVectorizer(stop_words='english').fit_transform(titles)
-    sim_matrix = cosine_similarity(tfidf)
+    """Drop every headline whose TF-IDF cosine with an earlier one exceeds threshold.
+
+    Vectors come from the shared featurizer, which caches them on each
+    headline. Small batches compare all pairs exactly; large ones only verify the
+    pairs MinHash/LSH proposes, which is roughly linear in the batch size.
+    """
+    if not headlines:
+        return []
 
-    to_remove = set()
-    for i in range(len(sim_matrix)):
-        for j in range(i + 1, len(sim_matrix)):
-            if sim_matrix[i, j] > threshold:
-                to_remove.add(j)
+    tfidf = text_features.tfidf(headlines)
 
+    if len(headlines) < LSH_MIN_ROWS:
+        _, later = exact_similar_pairs(tfidf, threshold)
+    else:
+        _, later = lsh_similar_pairs(tfidf, threshold)
+
+    to_remove = set(later.tolist())
     deduped = [h for idx, h in enumerate(headlines) if idx not in to_remove]
     return deduped
 
 
 
 def classify_category(title: str) -> str:
-    title = title.lower()
-    categories = {
-        "Politics": ["election", "president", "prime minister", "parliament", "government", "bjp", "congress", "modi", "biden"],
-        "Technology": ["tech", "ai", "software", "robot", "startup", "elon", "musk", "chatgpt", "openai", "spacex"],
-        "Health": ["covid", "health", "virus", "hospital", "vaccine", "disease", "flu"],
-        "Finance": ["stock", "inflation", "economy", "market", "crypto", "bitcoin", "bank", "recession"],
-        "World": ["war", "iran", "russia", "china", "usa", "diplomacy", "israel"],
-        "Entertainment": ["movie", "film", "celebrity", "actor", "bollywood", "tv", "series", "music", "festival"],
-        "Sports": ["football", "cricket", "tournament", "match", "goal", "win", "cup", "olympics"],
-    }
-
-    # Give score for each category
-    scores = {}
-    for cat, keywords in categories.items():
-        scores[cat] = sum(title.count(k) for k in keywords)
-
-    # If all are 0 → return General
-    if all(score == 0 for score in scores.values()):
-        return "General"
-
-    # Prioritize the most specific category (tie-breaking)
-    priority = ["Sports", "Politics", "Technology", "Finance", "World", "Health", "Entertainment"]
-
-    # Sort by score, then priority order
-    sorted_scores = sorted(scores.items(), key=lambda x: (-x[1], priority.index(x[0]) if x[0] in priority else 999))
-
-    return sorted_scores[0][0]
+    _, category = keyword_matcher.analyze(title)
+    return category
+
+def score_and_classify(title, upvotes=None, comments=None, views=None):
+    """score_headline and classify_category from a single scan of the title."""
+    score, category = keyword_matcher.analyze(title)
+    return score + engagement_score(upvotes, comments, views), category
+
+def score_headlines_batch(titles, upvotes=None, comments=None, views=None):
+    """score_headline over whole arrays; returns a NumPy array of scores.
+
+    upvotes/comments/views are per-title sequences (None entries allowed)
+    or None when a batch has no such data. Results match score_headline
+    exactly, including Python's floor division on negative counts.
+    """
+    n = len(titles)
+    lengths = np.fromiter(map(len, titles), dtype=np.int64, count=n)
+    questions = np.fromiter((t.endswith('?') for t in titles), dtype=bool, count=n)
+
+    scores = keyword_matcher.keyword_points_batch(titles).astype(np.int64)
+    scores = scores + np.where(lengths > 80, 3, np.where(lengths < 30, -2, 0))
+    scores = scores + np.where(questions, 2, 0)
+
+    # Engagement scoring; a missing value contributes nothing, like a falsy one
+    for values, divisor, cap in ((upvotes, 50, 10), (comments, 10, 5), (views, 1000, 5)):
+        if values is None:
+            continue
+        values = np.array([0 if v is None else v for v in values])
+        scores = scores + np.minimum(values // divisor, cap)
+
+    return scores
+
+def score_and_classify_batch(titles):
+    """Text-only (score, category) for every title, scanning the batch at once.
+
+    Categories come from the ML classifier, if enabled, where it is
+    confident and from the keyword matcher otherwise.
+    """
+    analyzed = keyword_matcher.analyze_batch(titles)
+    labels = headline_classifier.classify_batch(titles, [category for _, category in analyzed])
+    return [(score, label) for (score, _), label in zip(analyzed, labels)]
+
+# --- Keyword Matching ---
+categories = {
+    "Politics": ["election", "president", "prime minister", "parliament", "government", "bjp", "congress", "modi", "biden"],
+    "Technology": ["tech", "ai", "software", "robot", "startup", "elon", "musk", "chatgpt", "openai", "spacex"],
+    "Health": ["covid", "health", "virus", "hospital", "vaccine", "disease", "flu"],
+    "Finance": ["stock", "inflation", "economy", "market", "crypto", "bitcoin", "bank", "recession"],
+    "World": ["war", "iran", "russia", "china", "usa", "diplomacy", "israel"],
+    "Entertainment": ["movie", "film", "celebrity", "actor", "bollywood", "tv", "series", "music", "festival"],
+    "Sports": ["football", "cricket", "tournament", "match", "goal", "win", "cup", "olympics"],
+}
+
+# Prioritize the most specific category (tie-breaking)
+priority = ["Sports", "Politics", "Technology", "Finance", "World", "Health", "Entertainment"]
+
+def trie_pattern(terms):
+    """Regex matching the longest of terms at the current position, trie-factored."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional tail: try the longer term first, fall back to this one
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Scores and classifies a title with one regex scan over it.
+
+    Every term is compiled into a single trie-shaped pattern inside a
+    lookahead, so each position of the title reports the longest term
+    starting there. The other terms starting at that position are exactly
+    its prefixes that are terms too, which gives the same answers as the
+    per-keyword `in` checks and str.count calls this replaces.
+    """
+
+    def __init__(self, keywords, entities, categories, priority):
+        self.points = Counter()  # Listed twice counts twice, like the old loops
+        for word in keywords:
+            self.points[word] += 10
+        for entity in entities:
+            self.points[entity] += 5
+
+        self.term_categories = defaultdict(list)
+        for cat, terms in categories.items():
+            for term in terms:
+                self.term_categories[term].append(cat)
+        self.rank = {cat: priority.index(cat) if cat in priority else 999 for cat in categories}
+
+        self.point_terms = list(self.points)
+        self.point_weights = np.array([self.points[term] for term in self.point_terms], dtype=np.int64)
+        self.term_patterns = [re.compile(re.escape(term)) for term in self.point_terms]
+
+        terms = set(self.points) | set(self.term_categories)
+        self.prefix_terms = {
+            term: [term[:i] for i in range(1, len(term) + 1) if term[:i] in terms]
+            for term in terms
+        }
+        self.pattern = re.compile("(?=(" + trie_pattern(terms) + "))") if terms else None
+
+    def scan(self, hits):
+        """Keyword points and category counts from (position, longest term) hits."""
+        present = set()
+        counts = Counter()
+        next_free = {}
+        for start, longest in hits:
+            for term in self.prefix_terms[longest]:
+                present.add(term)
+                # str.count semantics: occurrences of one term never overlap
+                if start >= next_free.get(term, 0):
+                    next_free[term] = start + len(term)
+                    for cat in self.term_categories.get(term, ()):
+                        counts[cat] += 1
+        return sum(self.points[term] for term in present), counts
+
+    def finish(self, title, points, counts):
+        score = points
+
+        # Length scoring
+        title_length = len(title)
+        if title_length > 80:
+            score += 3
+        elif title_length < 30:
+            score -= 2  # Very short titles often lack context
+
+        # Question bonus
+        if title.endswith('?'):
+            score += 2
+
+        # If all are 0 → return General
+        if not counts:
+            return score, "General"
+        category = min(counts, key=lambda cat: (-counts[cat], self.rank[cat]))
+        return score, category
+
+    def analyze(self, title):
+        """(text score, category) for a single title."""
+        matches = self.pattern.finditer(title.lower()) if self.pattern else ()
+        return self.finish(title, *self.scan((m.start(), m.group(1)) for m in matches))
+
+    def batch_hits(self, titles):
+        """(position, longest term) hits per title from one scan over the joined batch."""
+        hits = [[] for _ in titles]
+        if not self.pattern:
+            return hits
+
+        # Lowercase per title first: lower() can change a string's length.
+        # No term contains a newline, so no match can straddle two titles.
+        lowered = [title.lower() for title in titles]
+        offsets = [0]
+        for text in lowered:
+            offsets.append(offsets[-1] + len(text) + 1)
+
+        for match in self.pattern.finditer("\n".join(lowered)):
+            index = bisect_right(offsets, match.start()) - 1
+            hits[index].append((match.start() - offsets[index], match.group(1)))
+        return hits
+
+    def analyze_batch(self, titles):
+        """(text score, category) per title from one scan over the joined batch."""
+        hits = self.batch_hits(titles)
+        return [self.finish(title, *self.scan(title_hits)) for title, title_hits in zip(titles, hits)]
+
+    def presence_matrix(self, titles):
+        """Sparse titles x point_terms matrix, 1 where the term occurs in the title.
+
+        One C-level search per term over the joined, lowercased batch; hits
+        are mapped back to titles with searchsorted, so no per-title Python runs.
+        """
+        lowered = [title.lower() for title in titles]
+        starts = np.cumsum([0] + [len(text) + 1 for text in lowered[:-1]]) if lowered else np.empty(0, dtype=np.int64)
+        text = "\n".join(lowered)
+
+        rows, cols = [], []
+        for col, pattern in enumerate(self.term_patterns):
+            positions = np.fromiter((m.start() for m in pattern.finditer(text)), dtype=np.int64)
+            hit = np.unique(np.searchsorted(starts, positions, side="right") - 1)
+            rows.append(hit)
+            cols.append(np.full(len(hit), col))
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(titles), len(self.point_terms)),
+        )
+
+    def keyword_points_batch(self, titles):
+        """Just the keyword/entity points per title, as a NumPy array."""
+        return self.presence_matrix(titles) @ self.point_weights
+
+keyword_matcher = KeywordMatcher(keywords, important_entities, categories, priority)
+
+# --- ML Classification ---
+CLASSIFIER_PATH = os.getenv("HEADLINE_CLASSIFIER_PATH", "headline_classifier.joblib")
+CLASSIFIER_MIN_CONFIDENCE = 0.6
+# Off until a model beats the keywords: the bundled one never overrides them at
+# CLASSIFIER_MIN_CONFIDENCE (see benchmarks/bench_classifier.py)
+CLASSIFIER_ENABLED = os.getenv("HEADLINE_CLASSIFIER_ENABLED", "").lower() in ("1", "true", "yes")
+
+class HeadlineClassifier:
+    """The joblib text pipeline, loaded on first use and run once per batch.
+
+    Arrays are memory-mapped so forked workers share one copy. A title keeps
+    its keyword category when the model is unsure: below min_confidence, or
+    predicting "General", which the model uses as its catch-all. A disabled
+    classifier never loads the model and always returns the keyword labels.
+    """
+
+    def __init__(self, path, min_confidence=CLASSIFIER_MIN_CONFIDENCE, enabled=CLASSIFIER_ENABLED):
+        self.path = path
+        self.min_confidence = min_confidence
+        self.enabled = enabled
+        self.model = None
+        self.load_failed = False
+        self.lock = threading.Lock()
+
+    def load(self):
+        """The model, or None if it is missing or could not be unpickled."""
+        if self.model is None and not self.load_failed:
+            with self.lock:
+                if self.model is None and not self.load_failed:
+                    try:
+                        self.model = joblib.load(self.path, mmap_mode="r")
+                    except Exception as e:
+                        self.load_failed = True
+                        logger.warning(f"Headline classifier unavailable, using keywords only: {e}")
+        return self.model
+
+    def classify_batch(self, titles, fallback):
+        """One predict_proba call for all titles; fallback[i] where the model is unsure."""
+        if not self.enabled or not titles:
+            return list(fallback)
+        model = self.load()
+        if model is None:
+            return list(fallback)
+        try:
+            probabilities = model.predict_proba(titles)
+        except Exception as e:
+            logger.warning(f"Headline classifier failed, using keywords: {e}")
+            return list(fallback)
+
+        predicted = model.classes_[probabilities.argmax(axis=1)]
+        confident = (probabilities.max(axis=1) >= self.min_confidence) & (predicted != "General")
+        return [str(label) if ok else keyword_label for label, ok, keyword_label in zip(predicted, confident, fallback)]
 
+headline_classifier = HeadlineClassifier(CLASSIFIER_PATH)
@@ -1,11 +1,18 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from bisect import bisect_right
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime
-import threading
+import asyncio
+import gzip
+import hashlib
+import json
 import time
 import logging
 from logging.config import dictConfig
@@ -14,23 +21,19 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 import os
 import signal
-from agent import score_headline, deduplicate_headlines, classify_category
-from scraper import (
-    fetch_google_news,
-    fetch_reddit_news,
-    fetch_hackernews,
-    fetch_ycombinator,
-    fetch_yahoo_finance_news,
-    fetch_espn_news,
-    fetch_twitter_trending
-)
-import requests
+from agent import deduplicate_headlines, engagement_score, score_and_classify_batch
+import async_scraper
 from fastapi import Request, Query
-from agent import score_headline, deduplicate_headlines
 from fastapi import APIRouter
-from weather import get_location, get_weather_data
-import csv
-from del_Dupe import remove_duplicate_rows
+from weather import get_cell_weather, get_location, get_weather_data
+from scraper import feed_validators
+from seen_stories import seen_stories, title_fingerprint
+from shared_cache import SHARED_POLL_INTERVAL, scraper_lock, shared_snapshot
+from poll_scheduler import poll_scheduler
+from headline_store import headline_store
+from notifications import notifier
+from metrics import (CYCLE_ERRORS, CYCLE_SECONDS, DEDUP_RATIO, HEADLINES_FETCHED, HEADLINES_PUBLISHED,
+                     STAGE_SECONDS, TRENDING_AGE)
 # --- Configuration ---
 API_KEY = os.getenv("API_KEY", "mysecretkey")  # Override with .env in production
 PROMETHEUS_PORT = 8001
@@ -57,8 +60,9 @@ logger = logging.getLogger(__name__)
 
 # --- Globals ---
 cached_headlines = []
-scraper_thread: Optional[threading.Thread] = None
-shutdown_event = threading.Event()
+clear_count = 0  # Bumped by every clear, so a publish already underway can tell it is stale
+scraper_task: Optional[asyncio.Task] = None
+shutdown_event = asyncio.Event()
 
 # --- Models ---
 class Headline(BaseModel):
@@ -70,112 +74,339 @@ class Headline(BaseModel):
     #summary: Optional[str] = None
     timestamp: datetime
 
-# --- CSV Export ---
-
-def export_headlines_to_csv():
-    try:
-        file_exists = os.path.isfile("headlines.csv")
-
-        with open("headlines.csv", "a", newline='', encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["title", "category", "source", "score", "timestamp"])
-
-            if not file_exists:
-                writer.writeheader()
-
-            for h in cached_headlines:
-                writer.writerow({
-                    "title": h["title"],
-                    "category": h.get("category", "General"),
-                    "source": h.get("source", "Unknown")
-                    #"score": h.get("score", 0),
-                    #"timestamp": h.get("timestamp", datetime.utcnow()).isoformat()
-                })
-
-        logger.info("✅ Headlines appended to headlines.csv")
-        remove_duplicate_rows('headlines.csv','headlines.csv')
+# --- Pre-serialized /trending ---
+@dataclass(frozen=True)
+class TrendingPayload:
+    body: bytes     # JSON exactly as response_model=List[Headline] would render it
+    gzipped: bytes
+    etag: str       # Strong validator over body
+    items: tuple    # Each headline's JSON, best score first
+    indexes: dict   # (category, source) filter, lowercase or None -> TrendingIndex
+    keys: tuple     # Each headline's (title, link), parallel to items
+
+@dataclass(frozen=True)
+class TrendingIndex:
+    positions: list       # Ascending positions into items, i.e. descending score
+    negated_scores: list  # -score per position, ascending, for min_score bisects
+
+def build_trending_index(valid):
+    grouped = defaultdict(list)
+    for position, h in enumerate(valid):
+        category, source = (h.category or "General").lower(), h.source.lower()
+        for key in ((None, None), (category, None), (None, source), (category, source)):
+            grouped[key].append(position)
+    return {
+        key: TrendingIndex(positions, [-valid[p].score for p in positions])
+        for key, positions in grouped.items()
+    }
 
+def build_trending_payload(headlines):
+    valid = []
+    for h in headlines:
+        try:
+            valid.append(Headline.model_validate(h))
+        except ValidationError as e:
+            logger.warning(f"Leaving malformed headline out of /trending: {h.get('title')!r}: {e.error_count()} errors")
+    valid.sort(key=lambda h: h.score, reverse=True)
+
+    items = tuple(h.model_dump_json().encode("utf-8") for h in valid)
+    body = b"[" + b",".join(items) + b"]"
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    keys = tuple((h.title, h.link) for h in valid)
+    return TrendingPayload(
+        body, gzip.compress(body, compresslevel=6, mtime=0), etag, items, build_trending_index(valid), keys,
+    )
 
-    except Exception as e:
-        logger.error(f"CSV export failed: {str(e)}")
-
-
-ONESIGNAL_APP_ID="ccebf6b2-767a-4fe8-ad2a-a2a2a2f66adc"
-ONESIGNAL_API_KEY="os_v2_app_ztv7nmtwpjh6rljkukrkf5tk3sakpd7zavsufrnsp5wp7m6a5xkvabyhytryejzcuqjngybo6yqbnpmqpqpwsqkcdzuinoconaiqvei"
-# --- Notification ---
-def notify_users(headline: dict):
-    payload = {
-        "app_id": ONESIGNAL_APP_ID,
-        "included_segments": ["All"],
-        "headings": {"en": "📢 Breaking News"},
-        "contents": {"en": headline.get("title", "No title")},
-        "url": headline.get("link", "https://pulse.news")
-    }
-    headers = {
-        "Authorization": f"Basic {ONESIGNAL_API_KEY}",
-        "Content-Type": "application/json"
-    }
+def publish_headlines(headlines, scraped_at=None, payload=None):
+    """Swap in a new headline list and its serialized response together.
+
+    Pass a payload already built off the event loop to skip building it here.
+    """
+    global cached_headlines, trending_payload, trending_scraped_at
+    if payload is None:
+        payload = build_trending_payload(headlines)
+    previous = trending_payload
+    cached_headlines, trending_payload = headlines, payload
+    trending_scraped_at = scraped_at or time.time()
+    HEADLINES_PUBLISHED.set(len(payload.items))
+    trending_broadcast.publish_diff(previous, payload)
+
+def trending_page(payload, category=None, source=None, min_score=None, limit=None, after=-1):
+    """Positions of one filtered page and the cursor position after it (or None).
+
+    Bisects the matching index for the cursor and the min_score cut-off, so
+    a page costs O(log n + page size) rather than a scan of every headline.
+    """
+    index = payload.indexes.get((category and category.lower(), source and source.lower()))
+    if index is None:
+        return [], None
+    start = bisect_right(index.positions, after)
+    end = len(index.positions) if min_score is None else bisect_right(index.negated_scores, -min_score)
+    if limit is not None and start + limit < end:
+        page = index.positions[start:start + limit]
+        return page, page[-1]
+    return index.positions[start:end], None
+
+# --- Push Channel ---
+SSE_REPLAY_CYCLES = 16  # Diffs kept for clients reconnecting with Last-Event-ID
+SSE_HEARTBEAT = 15  # Seconds between keep-alive comments on an idle stream
+SSE_RESET_FRAME = b"event: reset\ndata: {}\n\n"
+SSE_HEARTBEAT_FRAME = b": ping\n\n"
+
+class TrendingBroadcast:
+    """Per-cycle diff frames for /trending/stream, shared by every subscriber.
+
+    Each frame is rendered once when a cycle is published; subscribers only
+    hold a sequence number and wait on one shared Event, so an idle stream
+    costs a parked coroutine and a heartbeat every SSE_HEARTBEAT seconds.
+    """
+
+    def __init__(self, replay=SSE_REPLAY_CYCLES):
+        self.frames = deque(maxlen=replay)  # (seq, SSE frame bytes), oldest first
+        self.seq = 0
+        self.changed = asyncio.Event()
+        self.closed = False
+
+    def publish_diff(self, previous, payload):
+        """Queue an added/removed frame if the headline set changed."""
+        old_keys = set(previous.keys)
+        new_keys = set(payload.keys)
+        added = [item for key, item in zip(payload.keys, payload.items) if key not in old_keys]
+        removed = [{"title": title, "link": link} for title, link in previous.keys if (title, link) not in new_keys]
+        if not added and not removed:
+            return
+
+        self.seq += 1
+        data = b'{"added":[' + b",".join(added) + b'],"removed":' + json.dumps(removed, separators=(",", ":")).encode("utf-8") + b"}"
+        self.frames.append((self.seq, b"id: %d\nevent: diff\ndata: %s\n\n" % (self.seq, data)))
+        # Wake everyone waiting on the old Event; later waiters get a fresh one
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def close(self):
+        self.closed = True
+        self.changed.set()
+
+    def since(self, seq):
+        """Frames after seq, or None when some of them have already been dropped."""
+        if seq > self.seq or (self.frames and self.frames[0][0] > seq + 1) or (not self.frames and seq < self.seq):
+            return None
+        return [frame for frame_seq, frame in self.frames if frame_seq > seq]
+
+    async def subscribe(self, last_event_id=None):
+        seq = self.seq if last_event_id is None else last_event_id
+        while not self.closed:
+            if seq == self.seq:
+                changed = self.changed
+                try:
+                    await asyncio.wait_for(changed.wait(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield SSE_HEARTBEAT_FRAME
+                continue
+
+            latest, backlog = self.seq, self.since(seq)
+            seq = latest
+            if backlog is None:
+                # Too far behind to replay: the client should refetch /trending
+                yield SSE_RESET_FRAME
+                continue
+            for frame in backlog:
+                yield frame
+
+trending_broadcast = TrendingBroadcast()
+trending_payload = build_trending_payload([])
+trending_scraped_at = None  # Wall-clock time the published headlines were scraped
+TRENDING_AGE.set_function(lambda: time.time() - trending_scraped_at if trending_scraped_at else float("nan"))
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def accepts_gzip(accept_encoding):
+    """Whether Accept-Encoding allows gzip; an explicit gzip entry overrides "*"."""
+    qualities = {}
+    for coding in (accept_encoding or "").lower().split(","):
+        name, *params = coding.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name.strip()] = q
+    q = qualities.get("gzip", qualities.get("*"))
+    return q is not None and q > 0
+
+# --- Headline History ---
+def store_headlines(headlines):
     try:
-        r = requests.post("https://onesignal.com/api/v1/notifications", json=payload, headers=headers)
-        r.raise_for_status()
-        logger.info("🔔 Notification sent")
+        count = headline_store.upsert(headlines)
+        logger.info(f"✅ {count} headlines upserted into {headline_store.path}")
     except Exception as e:
-        logger.error(f"[OneSignal Error] {e}")
+        logger.error(f"Headline store update failed: {str(e)}")
+
 
 # --- Scraper Function ---
-def scheduled_scrape():
-    global cached_headlines
+def rank_headlines(all_headlines):
+    """Score, classify, dedupe and sort one merged batch; CPU-bound, run off the loop."""
+    # Stories from earlier polls reuse their text score and category;
+    # only the engagement terms can have moved since then
+    with STAGE_SECONDS.labels("score_classify").time():
+        # A story carried by several sources is scored and classified once
+        known_records = [seen_stories.lookup(h) for h in all_headlines]
+        new_stories = {}  # fingerprint -> title, first copy wins
+        for h, known in zip(all_headlines, known_records):
+            if not known:
+                new_stories.setdefault(title_fingerprint(h["title"]), h["title"])
+        analyzed = dict(zip(new_stories, score_and_classify_batch(list(new_stories.values()))))
+
+        for h, known in zip(all_headlines, known_records):
+            if known:
+                base_score, category = known["base_score"], known["category"]
+            else:
+                base_score, category = analyzed[title_fingerprint(h["title"])]
+            seen_stories.remember(h, base_score, category)
+
+            h["score"] = (base_score + engagement_score(upvotes=h.get("upvotes"),
+                comments=h.get("comments"),
+                views=h.get("views"))) * h.get("weight", 1.0)
+            h["category"] = category
+
+    logger.info(f"{len(new_stories)} new stories in {len(all_headlines)} headlines")
+
+    with STAGE_SECONDS.labels("dedup").time():
+        deduped = deduplicate_headlines(all_headlines)
+    if all_headlines:
+        DEDUP_RATIO.set(1 - len(deduped) / len(all_headlines))
+    with STAGE_SECONDS.labels("sort").time():
+        return sorted(deduped, key=lambda x: x["score"], reverse=True)
+
+async def publish_sources():
+    """Rank and publish every source's latest headlines, then record them.
+
+    The CPU-heavy stages run in a worker thread so /trending, /weather and
+    the SSE stream keep being served while a batch is processed.
+    """
+    clears_before = clear_count
+    all_headlines = poll_scheduler.headlines()
+    HEADLINES_FETCHED.set(len(all_headlines))
+
+    deduped_sorted = await asyncio.to_thread(rank_headlines, all_headlines)
+    if clear_count != clears_before:
+        # Publishing now would undo the clear; the cleared sources are polled again right away
+        logger.info("Cache cleared while ranking, dropping this batch")
+        return
+    top = deduped_sorted[0] if deduped_sorted else None
+    if top and top["score"] > 20:
+        notifier.enqueue(top)
+
+    with STAGE_SECONDS.labels("publish").time():
+        payload = await asyncio.to_thread(build_trending_payload, deduped_sorted)
+        if clear_count != clears_before:
+            logger.info("Cache cleared while ranking, dropping this batch")
+            return
+        publish_headlines(deduped_sorted, payload=payload)
+        await asyncio.to_thread(shared_snapshot.write, trending_payload.body)
+    logger.info(f"{len(cached_headlines)} headlines cached after deduplication.")
+
+    # Known stories only get their score and last_seen moved
+    with STAGE_SECONDS.labels("store").time():
+        await asyncio.to_thread(store_headlines, cached_headlines)
+        await asyncio.to_thread(feed_validators.save)
+        await asyncio.to_thread(seen_stories.save)
+
+async def clear_published():
+    """Publish an empty list; on the scraper, also drop the headlines it would republish."""
+    global clear_count
+    clear_count += 1
+    if scraper_lock.held:
+        poll_scheduler.clear()
+    publish_headlines([])
+    await asyncio.to_thread(shared_snapshot.write, trending_payload.body)
+
+async def scheduled_scrape():
+    # Loaded here rather than at startup: a reader worker may take over later
+    await asyncio.to_thread(feed_validators.load)
+    await asyncio.to_thread(seen_stories.load)
     while not shutdown_event.is_set():
         try:
-            logger.info("Running scheduled scrape...")
-
-            all_headlines = []
-            all_headlines += fetch_google_news()
-            all_headlines += fetch_reddit_news()
-            all_headlines += fetch_hackernews()
-            all_headlines += fetch_ycombinator()
-            all_headlines += fetch_yahoo_finance_news()
-            all_headlines += fetch_espn_news()
-            all_headlines += fetch_twitter_trending()
+            if await asyncio.to_thread(shared_snapshot.take_clear_request):
+                await clear_published()
 
-            logger.info(f"Total raw headlines fetched: {len(all_headlines)}")
+            # Each source is polled on its own adaptive interval (see poll_scheduler.py);
+            # /trending is rebuilt only when a poll turned up new stories
+            if poll_scheduler.due(time.monotonic()):
+                cycle_start = time.monotonic()
+                with STAGE_SECONDS.labels("fetch").time():
+                    timings, new_stories = await poll_scheduler.poll_due()
 
-            for h in all_headlines:
-                h["score"] = score_headline(h["title"], upvotes=h.get("upvotes"),
-                    comments=h.get("comments"),
-                    views=h.get("views"))
-                h["category"] = classify_category(h["title"])
-                h["timestamp"] = datetime.utcnow()
+                logger.info(f"Polled {len(timings)} sources in {time.monotonic() - cycle_start:.2f}s, "
+                            f"{new_stories} new stories", extra={"sources": timings})
 
-            deduped = deduplicate_headlines(all_headlines)
-            deduped_sorted = sorted(deduped, key=lambda x: x["score"], reverse=True)
-            top = deduped_sorted[0] if deduped_sorted else None
-            if top and top["score"] > 20:
-                notify_users(top)
+                if new_stories:
+                    with STAGE_SECONDS.labels("rebuild").time():  # Rank, publish and store as a whole
+                        await publish_sources()
+                CYCLE_SECONDS.observe(time.monotonic() - cycle_start)
 
-            cached_headlines = deduped_sorted
-            logger.info(f"{len(cached_headlines)} headlines cached after deduplication.")
-
-            export_headlines_to_csv()  # Auto-export after every scrape
-
-            time.sleep(600)
+            # Wake at least every SHARED_POLL_INTERVAL to honour a reader's clear request
+            await wait_for_shutdown(min(SHARED_POLL_INTERVAL, max(1, poll_scheduler.next_due() - time.monotonic())))
 
         except Exception as e:
             logger.error(f"Scraper error: {str(e)}")
-            time.sleep(10)
+            CYCLE_ERRORS.inc()
+            await wait_for_shutdown(10)
+
+async def follow_scraper():
+    """Serve the scraping worker's snapshots until this worker can take its lock."""
+    while not shutdown_event.is_set():
+        if scraper_lock.try_acquire():
+            logger.info("Scraper lock acquired, taking over scraping")
+            await scheduled_scrape()
+            return
+        body = await asyncio.to_thread(shared_snapshot.read_if_changed)
+        if body is not None:
+            headlines = json.loads(body)
+            payload = await asyncio.to_thread(build_trending_payload, headlines)
+            publish_headlines(headlines, shared_snapshot.modified_at, payload)
+            logger.info(f"{len(cached_headlines)} headlines loaded from the shared snapshot.")
+        await wait_for_shutdown(SHARED_POLL_INTERVAL)
+
+async def wait_for_shutdown(seconds):
+    """Sleep between cycles, waking early if the app is shutting down."""
+    try:
+        await asyncio.wait_for(shutdown_event.wait(), seconds)
+    except asyncio.TimeoutError:
+        pass
 
 # --- Lifespan Handler ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global scraper_thread
+    global scraper_task
 
     logger.info("Starting application...")
 
-    scraper_thread = threading.Thread(
-        target=scheduled_scrape,
-        name="background_scraper",
-        daemon=True
-    )
-    scraper_thread.start()
+    shutdown_event.clear()
+    trending_broadcast.closed = False
+    async_scraper.open_client()
+    notifier.start()
+
+    # Serve the last published cycle (if any) until a fresh one lands
+    body = shared_snapshot.read_if_changed()
+    if body is not None:
+        publish_headlines(json.loads(body), shared_snapshot.modified_at)
+
+    # Only one worker per host scrapes; the rest follow its snapshots
+    if scraper_lock.try_acquire():
+        scraper_task = asyncio.create_task(scheduled_scrape(), name="background_scraper")
+    else:
+        logger.info("Another worker holds the scraper lock, serving its snapshots")
+        scraper_task = asyncio.create_task(follow_scraper(), name="background_scraper")
 
     def handle_shutdown(signum, frame):
         logger.warning(f"Received signal {signum}, shutting down...")
@@ -189,8 +420,16 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down background scraper...")
     shutdown_event.set()
-    if scraper_thread:
-        scraper_thread.join(timeout=5)
+    trending_broadcast.close()
+    if scraper_task:
+        try:
+            await asyncio.wait_for(scraper_task, timeout=5)
+        except asyncio.TimeoutError:
+            logger.warning("Background scraper did not stop in time, cancelled")
+    scraper_lock.release()
+    headline_store.close()
+    await notifier.stop()
+    await async_scraper.close_client()
 
 # --- App Setup ---
 app = FastAPI(
@@ -205,6 +444,7 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_methods=["GET"],
     allow_headers=["Content-Type", "X-API-Key"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # --- Rate Limiting ---
@@ -224,39 +464,77 @@ async def verify_api_key(key: str = Depends(auth_header)):
 def health_check():
     return {
         "status": "running",
-        "scraper_alive": scraper_thread.is_alive() if scraper_thread else False,
+        "scraper_alive": scraper_task is not None and not scraper_task.done(),
+        "role": "scraper" if scraper_lock.held else "reader",
         "headlines_cached": len(cached_headlines)
     }
 
 @app.get("/trending", response_model=List[Headline])
 @limiter.limit("100/minute")
-def get_trending(request: Request):
-    return cached_headlines
+def get_trending(
+    request: Request,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    min_score: Optional[float] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    # Serve the bytes built once per scrape cycle; no per-request validation
+    payload = trending_payload
+    filtered = any(v is not None for v in (category, source, min_score, limit, cursor))
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+    if not filtered:
+        body, gzipped, etag = payload.body, payload.gzipped, payload.etag
+    else:
+        generation = payload.etag[1:9]
+        after = -1
+        if cursor is not None:
+            cursor_generation, _, position = cursor.partition("-")
+            if cursor_generation != generation or not position.isdigit():
+                raise HTTPException(status_code=410, detail="Cursor expired; request the first page again")
+            after = int(position)
+
+        page, next_position = trending_page(payload, category, source, min_score, limit, after)
+        if next_position is not None:
+            headers["X-Next-Cursor"] = f"{generation}-{next_position}"
+        query = f"{payload.etag}|{category}|{source}|{min_score}|{limit}|{cursor}".encode("utf-8")
+        etag = f'"{hashlib.blake2b(query, digest_size=16).hexdigest()}"'
+        body, gzipped = b"[" + b",".join(payload.items[p] for p in page) + b"]", None
+
+    headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        gzipped = gzipped or gzip.compress(body, compresslevel=6)
+        return Response(gzipped, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(body, media_type="application/json", headers=headers)
+
+@app.get("/trending/stream")
+async def stream_trending(request: Request):
+    """Server-Sent Events: one "diff" event per published cycle that changed the list."""
+    last_event_id = request.headers.get("last-event-id", "")
+    return StreamingResponse(
+        trending_broadcast.subscribe(int(last_event_id) if last_event_id.isdigit() else None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/admin/clear_cache", dependencies=[Depends(verify_api_key)])
-def clear_cache():
-    global cached_headlines
-    cached_headlines = []
+async def clear_cache():
+    await clear_published()
+    if not scraper_lock.held:
+        # The scraping worker holds the headlines; it clears them on its next wake-up
+        await asyncio.to_thread(shared_snapshot.request_clear)
     return {"status": "cache cleared"}
 
 @app.get("/weather")
-def weather_summary(lat: float = Query(...), lon: float = Query(...)):
-    try:
-        # use wttr.in with lat,lon
-        url = f"https://wttr.in/{lat},{lon}?format=j1"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-
-        current = data["current_condition"][0]
-        area = data["nearest_area"][0]["areaName"][0]["value"]
-
-        return {
-            "location": area,
-            "temperature": current["temp_C"],
-            "condition": current["weatherDesc"][0]["value"],
-        }
-    except Exception as e:
+async def weather_summary(lat: float = Query(..., ge=-90, le=90), lon: float = Query(..., ge=-180, le=180)):
+    # Served per ~5 km geohash cell from a TTL cache; see weather.get_cell_weather
+    summary = await get_cell_weather(lat, lon)
+    if summary is None:
         return {"error": "Unable to fetch weather"}
+    return summary
 
 @app.get("/")
 def read_root():
@@ -264,8 +542,22 @@ def read_root():
    
     
 
-'''On startup, a daemon thread runs scheduled_scrape().
+'''On startup, the lifespan handler starts scheduled_scrape() as an asyncio task.
+
+This task polls each source when it is due, on an interval that adapts to how
+often that source publishes new stories (see poll_scheduler.py), and re-scores,
+deduplicates and republishes cached_headlines whenever a poll brings new ones.
+
+/trending serves the JSON (and gzip) bytes built from that list once per cycle,
+answering If-None-Match with 304 while the ETag is unchanged. category, source,
+min_score, limit and cursor filter through per-category/per-source indexes built
+in the same step; the next page's cursor comes back in X-Next-Cursor.
+
+/trending/stream pushes the headlines added and removed by each cycle as
+Server-Sent Events, so clients can stop polling.
 
-This thread fetches, scores, deduplicates, and updates cached_headlines every 600 seconds (10 minutes).
+With several uvicorn workers only the one holding scraper.lock runs the loop; it
+writes each cycle to trending_snapshot.json, which the other workers re-publish.
 
-/trending simply returns this cached list.'''
\ No newline at end of file
+Every cycle is also upserted into headlines.db (see headline_store.py, which
+exports the history to CSV or Parquet on demand).'''
\ No newline at end of file
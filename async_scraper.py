@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from scraper import (
+    MAX_CONTENT_LENGTH,
+    READ_CHUNK_SIZE,
+    ROBOTS_ERROR_TTL,
+    REQUEST_TIMEOUT,
+    SOURCE_DEADLINE,
+    check_size,
+    feed_validators,
+    get_random_user_agent,
+    note_response,
+    pace_request,
+    parse_robots,
+    parse_source,
+    robots_cache,
+    robots_host,
+    robots_max_age,
+)
+from sources import SOURCES
+from metrics import SOURCE_BYTES, SOURCE_FETCH_SECONDS, SOURCE_ITEMS, record_cache
+
+# Async twins of the fetchers in scraper.py. They share parsing, the source
+# registry and configuration with the blocking versions but go through one pooled
+# HTTP/2 client so the whole scrape cycle runs on the app's event loop. They
+# keep no result cache: poll_scheduler.py decides when each source is fetched.
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- HTTP Client ---
+client: httpx.AsyncClient = None
+
+def open_client():
+    """Create the shared AsyncClient; call once from the app lifespan."""
+    global client
+    host_queues.clear()  # Locks belong to the previous event loop, if any
+    connect_timeout, read_timeout = REQUEST_TIMEOUT
+    client = httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    return client
+
+async def close_client():
+    global client
+    if client is not None:
+        await client.aclose()
+        client = None
+
+# --- Utility Functions ---
+host_queues = {}  # host -> asyncio.Lock its waiters queue on, in arrival order
+
+async def wait_for_slot(url, agent):
+    """Wait for url's host's next token, one waiter at a time.
+
+    Holding the host's lock across the sleep hands tokens out in arrival
+    order and lets each waiter see a Retry-After block set while it queued,
+    instead of every waiter waking at the same refill time.
+    """
+    lock = host_queues.setdefault(robots_host(url), asyncio.Lock())
+    async with lock:
+        delay = pace_request(url, agent)
+        if delay:
+            await asyncio.sleep(delay)  # Respectful scraping
+
+async def rate_limited_request(url, headers=None, stream=False):
+    """Make a GET request paced per host, with random User-Agent and timeout."""
+    headers = headers or {}
+    headers['User-Agent'] = get_random_user_agent()
+    await wait_for_slot(url, headers['User-Agent'])
+    request = client.build_request("GET", url, headers=headers)
+    response = await client.send(request, stream=stream)
+    note_response(url, response)
+    return response
+
+robots_inflight = {}  # host -> task fetching its robots.txt
+
+async def fetch_robots_parser(host):
+    robots_url = f"{host}/robots.txt"
+    try:
+        r = await client.get(robots_url, headers={"User-Agent": get_random_user_agent()})
+        rp = parse_robots(robots_url, r.status_code, r.text)
+        robots_cache.store(host, rp, robots_max_age(r.headers))
+    except Exception as e:
+        logger.warning(f"Could not process robots.txt for {host}: {e}")
+        rp = None  # Fail open
+        robots_cache.store(host, rp, ROBOTS_ERROR_TTL)
+    return rp
+
+async def get_robots_parser(url):
+    """Cached robots.txt parser for url's host; concurrent callers share one fetch."""
+    host = robots_host(url)
+    hit, rp = robots_cache.lookup(host)
+    record_cache("robots", hit)
+    if hit:
+        return rp
+
+    task = robots_inflight.get(host)
+    if task is None:
+        task = asyncio.ensure_future(fetch_robots_parser(host))
+        robots_inflight[host] = task
+        task.add_done_callback(lambda _: robots_inflight.pop(host, None))
+    # Shielded so one caller hitting its deadline doesn't cancel the others' fetch
+    return await asyncio.shield(task)
+
+async def check_robots_allowed(url, agent=None):
+    """Checks robots.txt and ensures scraping is allowed for the target URL."""
+    agent = agent or get_random_user_agent()
+    rp = await get_robots_parser(url)
+    if rp is None:
+        return True
+
+    allowed = rp.can_fetch(agent, url)
+    logger.debug(f"robots.txt allowed for agent '{agent}' on {url}: {allowed}")
+    return allowed
+
+async def read_capped(r, limit=MAX_CONTENT_LENGTH):
+    """Read a streamed response body, giving up as soon as it passes limit bytes."""
+    check_size(r)
+    body = bytearray()
+    async for chunk in r.aiter_bytes(READ_CHUNK_SIZE):
+        body += chunk
+        if len(body) > limit:
+            raise ValueError("Response too large")
+    return bytes(body)
+
+async def conditional_get(url, parse, headers=None):
+    """GET url with stored validators and parse it, reusing the last parse on a 304."""
+    headers = dict(headers or {})
+    headers.update(feed_validators.headers_for(url))
+
+    r = await rate_limited_request(url, headers=headers, stream=True)
+    try:
+        if r.status_code == 304:
+            logger.info(f"{url} not modified, reusing previous entries")
+            return feed_validators.headlines_for(url)
+
+        r.raise_for_status()
+        body = await read_capped(r)
+    finally:
+        await r.aclose()
+
+    headlines = await asyncio.to_thread(parse, body)  # feedparser/lxml are CPU-bound
+    feed_validators.remember(url, r.headers, headlines)
+    return headlines
+
+async def timed_fetch(func, deadline=SOURCE_DEADLINE):
+    """Await one fetcher within deadline; returns (headlines, timing).
+
+    Fetchers raise on failure. One that raises or misses the deadline yields
+    no headlines and a timing whose status is "error" or "timeout".
+    """
+    source = func.__name__.removeprefix("fetch_")
+    start = time.monotonic()
+    try:
+        result = await asyncio.wait_for(func(), deadline)
+    except asyncio.TimeoutError:
+        logger.warning(f"{func.__name__} missed the {deadline}s deadline")
+        SOURCE_FETCH_SECONDS.labels(source, "timeout").observe(deadline)
+        return [], {"status": "timeout", "seconds": deadline, "items": 0}
+    except httpx.HTTPError as e:
+        logger.warning(f"{func.__name__} network error: {e}")
+        SOURCE_FETCH_SECONDS.labels(source, "error").observe(time.monotonic() - start)
+        return [], {"status": "error", "seconds": None, "items": 0}
+    except Exception as e:
+        logger.error(f"{func.__name__} failed: {e}")
+        SOURCE_FETCH_SECONDS.labels(source, "error").observe(time.monotonic() - start)
+        return [], {"status": "error", "seconds": None, "items": 0}
+    elapsed = round(time.monotonic() - start, 3)
+    logger.info(f"{func.__name__} succeeded with {len(result)} items")
+    SOURCE_FETCH_SECONDS.labels(source, "ok").observe(elapsed)
+    return result, {"status": "ok", "seconds": elapsed, "items": len(result)}
+
+# --- Fetchers ---
+def make_poller(source):
+    """The async fetch for one registry Source; errors propagate.
+
+    There is no result cache: poll_scheduler decides when a source is due
+    and needs to see its failures. Conditional GETs still turn an unchanged
+    feed into a 304.
+    """
+    async def fetch():
+        if source.robots and not await check_robots_allowed(source.url):
+            logger.warning(f"Scraping not allowed by robots.txt: {source.url}")
+            return []
+        return await conditional_get(source.url, parse)
+
+    def parse(body):
+        # Only real downloads count: not 304s, which reuse the last parse
+        SOURCE_BYTES.labels(source.name).inc(len(body))
+        headlines = parse_source(source, body)
+        SOURCE_ITEMS.labels(source.name).inc(len(headlines))
+        return headlines
+
+    fetch.__name__ = fetch.__qualname__ = f"fetch_{source.name}"
+    return fetch
+
+POLLERS = {source.name: make_poller(source) for source in SOURCES}
+
+async def fetch_twitter_trending(source="twitter"):
+    logger.warning("Twitter scraping is disabled (requires JS rendering or API).")
+    return [{"title": "#MockTrend", "link": "https://twitter.com", "source": "Twitter"}]
+
+
+# Dev trigger for testing
+if __name__ == "__main__":
+    async def main():
+        open_client()
+        try:
+            fetchers = [*POLLERS.values(), fetch_twitter_trending]
+            results = await asyncio.gather(*(timed_fetch(func) for func in fetchers))
+            for func, (_, timing) in zip(fetchers, results):
+                print(f"{func.__name__}: {timing}")
+            print(f"{sum(len(headlines) for headlines, _ in results)} headlines fetched.")
+        finally:
+            await close_client()
+
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""Benchmark: ML headline classifier vs keyword classify_category.
+
+Accuracy is measured on benchmarks/fixtures/labeled_headlines.csv, the
+unique titles from headlines.csv labelled by hand. Throughput compares a
+classify_category loop with one batched predict over BATCH_SIZE titles.
+
+Run from the repo root:  python benchmarks/bench_classifier.py
+"""
+import csv
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import CLASSIFIER_PATH, HeadlineClassifier, classify_category
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "labeled_headlines.csv")
+BATCH_SIZE = 10_000
+THRESHOLDS = [0.0, 0.4, 0.6, 0.8]
+
+
+def accuracy(predicted, expected):
+    return sum(p == e for p, e in zip(predicted, expected)) / len(expected)
+
+
+def main():
+    with open(FIXTURE, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    titles = [row["title"] for row in rows]
+    expected = [row["category"] for row in rows]
+
+    classifier = HeadlineClassifier(CLASSIFIER_PATH, enabled=True)
+    start = time.perf_counter()
+    model = classifier.load()
+    print(f"model load: {time.perf_counter() - start:.3f}s")
+    if model is None:
+        sys.exit(f"could not load {CLASSIFIER_PATH}")
+
+    keyword_labels = [classify_category(t) for t in titles]
+    print(f"accuracy on {len(titles)} labelled titles")
+    print(f"  {'keywords':>20}: {accuracy(keyword_labels, expected):.3f}")
+    print(f"  {'model alone':>20}: {accuracy([str(c) for c in model.predict(titles)], expected):.3f}")
+    for threshold in THRESHOLDS:
+        classifier.min_confidence = threshold
+        labels = classifier.classify_batch(titles, keyword_labels)
+        print(f"  {f'hybrid @ {threshold}':>20}: {accuracy(labels, expected):.3f}")
+
+    batch = (titles * (BATCH_SIZE // len(titles) + 1))[:BATCH_SIZE]
+    fallback = [classify_category(t) for t in batch]
+    print(f"throughput over {BATCH_SIZE} titles")
+    for name, func in [
+        ("classify_category", lambda: [classify_category(t) for t in batch]),
+        ("classify_batch", lambda: classifier.classify_batch(batch, fallback)),
+    ]:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"  {name:>20}: {BATCH_SIZE / seconds:10.0f} titles/s")
+
+
+if __name__ == "__main__":
+    main()
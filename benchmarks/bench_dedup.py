@@ -0,0 +1,74 @@
+"""Benchmark: exact vs MinHash/LSH near-duplicate detection in agent.py.
+
+Builds a synthetic headline corpus where ~20% of titles are reworded
+copies of earlier ones, then times both pair finders and reports how many
+of the exact pairs the LSH path recovers.
+
+Run from the repo root:  python benchmarks/bench_dedup.py [sizes...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import deduplicate_headlines, exact_similar_pairs, lsh_similar_pairs
+from features import TextFeatures
+
+DEFAULT_SIZES = [10_000, 100_000]
+EXACT_MAX_ROWS = 100_000  # Past this the exact sparse product gets too large to wait for
+OUTLETS = ["Reuters", "BBC", "CNN", "Hindustan Times", "Times of India", "AP News"]
+
+
+def synthetic_titles(n, seed=7):
+    """Zipf-like pseudo-words, with some titles rewritten from earlier ones.
+
+    Word frequencies follow 1/(rank + 100), i.e. an English-like Zipf curve
+    with the stop-word head already cut off, as TfidfVectorizer would.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = [f"w{i}" for i in range(50_000)]
+    weights = 1.0 / (np.arange(len(vocab)) + 100)
+    weights /= weights.sum()
+    lengths = rng.integers(6, 14, size=n)
+    ranks = rng.choice(len(vocab), size=lengths.sum(), p=weights)
+    offsets = np.r_[0, np.cumsum(lengths)]
+    titles = []
+    for k in range(n):
+        if titles and rng.random() < 0.2:
+            words = titles[rng.integers(len(titles))].split(" - ")[0].split()
+            words[rng.integers(len(words))] = vocab[rng.integers(len(vocab))]
+            title = " ".join(words) + f" - {OUTLETS[rng.integers(len(OUTLETS))]}"
+        else:
+            title = " ".join(vocab[r] for r in ranks[offsets[k]:offsets[k + 1]])
+        titles.append(title)
+    return titles
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    for n in sizes:
+        titles = synthetic_titles(n)
+        tfidf, fit_s = timed(TextFeatures().tfidf, [{"title": t} for t in titles])
+        (left, right), lsh_s = timed(lsh_similar_pairs, tfidf, 0.7)
+        _, total_s = timed(deduplicate_headlines, [{"title": t} for t in titles])
+        line = f"n={n:>7}: tfidf {fit_s:6.2f}s | lsh pairs {lsh_s:6.2f}s ({len(left)} dup pairs) | dedup total {total_s:6.2f}s"
+
+        if n <= EXACT_MAX_ROWS:
+            (exact_left, exact_right), exact_s = timed(exact_similar_pairs, tfidf, 0.7)
+            found = set(zip(left.tolist(), right.tolist()))
+            expected = set(zip(exact_left.tolist(), exact_right.tolist()))
+            recall = len(found & expected) / len(expected) if expected else 1.0
+            line += f" | exact {exact_s:6.2f}s, lsh recall {recall:.4f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
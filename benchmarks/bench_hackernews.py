@@ -0,0 +1,30 @@
+"""Micro-benchmark: lxml iterparse vs BeautifulSoup for the Hacker News page.
+
+Run from the repo root:  python benchmarks/bench_hackernews.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import parse_hackernews, parse_hackernews_soup
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "hackernews.html")
+RUNS = 200
+
+
+def main():
+    with open(FIXTURE, "rb") as f:
+        html = f.read()
+
+    # Both paths must agree before their timings mean anything
+    assert parse_hackernews(html) == parse_hackernews_soup(html)
+
+    for name, parse in [("beautifulsoup", parse_hackernews_soup), ("lxml", parse_hackernews)]:
+        seconds = min(timeit.repeat(lambda: parse(html), number=RUNS, repeat=5)) / RUNS
+        print(f"{name:>14}: {seconds * 1000:.3f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
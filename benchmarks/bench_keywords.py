@@ -0,0 +1,108 @@
+"""Benchmark: single-pass keyword matcher vs the original per-keyword loops.
+
+The original score_headline / classify_category bodies are reproduced
+below as the baseline; both implementations must agree on every title
+before anything is timed. A second run pads the keyword lists with
+thousands of synthetic terms to show how each side scales.
+
+Run from the repo root:  python benchmarks/bench_keywords.py
+"""
+import csv
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent
+from agent import KeywordMatcher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTRA_TERMS = 3000
+
+
+def legacy_score(title, keywords, entities):
+    score = 0
+    title_lower = title.lower()
+    for word in keywords:
+        if word in title_lower:
+            score += 10
+    title_length = len(title)
+    if title_length > 80:
+        score += 3
+    elif title_length < 30:
+        score -= 2
+    for entity in entities:
+        if entity in title_lower:
+            score += 5
+    if title.endswith('?'):
+        score += 2
+    return score
+
+
+def legacy_category(title, categories, priority):
+    title = title.lower()
+    scores = {}
+    for cat, keywords in categories.items():
+        scores[cat] = sum(title.count(k) for k in keywords)
+    if all(score == 0 for score in scores.values()):
+        return "General"
+    sorted_scores = sorted(scores.items(), key=lambda x: (-x[1], priority.index(x[0]) if x[0] in priority else 999))
+    return sorted_scores[0][0]
+
+
+def load_titles():
+    with open(os.path.join(ROOT, "headlines.csv"), encoding="utf-8") as f:
+        titles = [row[0] for row in csv.reader(f) if row]
+    # Edge cases: overlapping and repeated terms, prefixes, case, unicode
+    titles += [
+        "AI said again: aaa Air India win window wine?", "usausa USA usa", "tvtv tv series TV",
+        "Breaking: just in, JUST IN", "İstanbul ai", "", "prime minister's primer", "elonmusk musk elon",
+    ]
+    return titles
+
+
+def padded_lists(rng):
+    """The shipped lists plus EXTRA_TERMS random terms spread over every list."""
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    extra = ["".join(rng.choice(alphabet) for _ in range(rng.randint(3, 9))) for _ in range(EXTRA_TERMS)]
+    keywords = agent.keywords + extra[:EXTRA_TERMS // 4]
+    entities = agent.important_entities + extra[EXTRA_TERMS // 4:EXTRA_TERMS // 2]
+    categories = {cat: terms[:] for cat, terms in agent.categories.items()}
+    for i, term in enumerate(extra[EXTRA_TERMS // 2:]):
+        categories[list(categories)[i % len(categories)]].append(term)
+    return keywords, entities, categories
+
+
+def compare(label, titles, keywords, entities, categories):
+    matcher = KeywordMatcher(keywords, entities, categories, agent.priority)
+
+    def legacy():
+        return [(legacy_score(t, keywords, entities), legacy_category(t, categories, agent.priority)) for t in titles]
+
+    def single():
+        return [matcher.analyze(t) for t in titles]
+
+    def batch():
+        return matcher.analyze_batch(titles)
+
+    expected = legacy()
+    assert single() == expected, f"{label}: analyze() disagrees with the original loops"
+    assert batch() == expected, f"{label}: analyze_batch() disagrees with the original loops"
+
+    print(f"{label} ({len(titles)} titles)")
+    for name, func in [("legacy loops", legacy), ("analyze", single), ("analyze_batch", batch)]:
+        seconds = min(timeit.repeat(func, number=5, repeat=3)) / 5
+        print(f"  {name:>14}: {seconds / len(titles) * 1e6:8.2f} us/title")
+
+
+def main():
+    rng = random.Random(7)
+    titles = load_titles()
+    compare("shipped keyword lists", titles * 20, agent.keywords, agent.important_entities, agent.categories)
+    compare(f"+{EXTRA_TERMS} terms", titles * 5, *padded_lists(rng))
+
+
+if __name__ == "__main__":
+    main()
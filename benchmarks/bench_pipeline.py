@@ -0,0 +1,344 @@
+"""Offline benchmark of the whole scrape -> serve path.
+
+Serves the recorded feeds in benchmarks/fixtures from a local HTTP stand-in
+and times:
+  - fetch: one PollScheduler round over every registry source, end to end
+  - parse: parse_source over every fixture body
+  - score, classify, dedup, sort, publish (the /trending payload build) and
+    export (headline_store upsert + CSV export), each at --sizes headlines
+  - in-process load on /trending (full, filtered page, 304) and /weather,
+    with /trending serving --sizes headlines
+
+Results go to a JSON file (flat "metric name -> number" map plus the commit
+and interpreter) so two runs can be diffed; --compare flags metrics that
+moved by more than --tolerance against an earlier file.
+
+Run from the repo root:  python benchmarks/bench_pipeline.py [--sizes 100 1000 10000]
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+STATE_DIR = tempfile.mkdtemp(prefix="pulse-bench-")
+sys.path.insert(0, ROOT)
+
+# Keep the app's state files out of the working tree
+for var, name in [("SEEN_STORIES_PATH", "seen.json"), ("FEED_VALIDATOR_PATH", "validators.json"),
+                  ("SCRAPER_LOCK_PATH", "scraper.lock"), ("SHARED_SNAPSHOT_PATH", "snapshot.json"),
+                  ("HEADLINE_DB_PATH", "headlines.db")]:
+    os.environ[var] = os.path.join(STATE_DIR, name)
+warnings.simplefilter("ignore")
+
+import httpx
+
+import agent
+import app
+import async_scraper
+import scraper
+import weather
+from headline_store import HeadlineStore
+from poll_scheduler import PollScheduler
+from scraper import HostThrottle, parse_source
+from sources import SOURCES
+
+logging.getLogger().setLevel(logging.WARNING)  # The app logs every fetch and request at INFO
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+DEFAULT_OUTPUT = "bench_output.json"
+REPEATS = 3
+HTTP_REQUESTS = 500
+HTTP_CONCURRENCY = 50
+WEATHER_CELLS = 50
+WEATHER_BODY = json.dumps({
+    "current_condition": [{"temp_C": "21", "weatherDesc": [{"value": "Sunny"}]}],
+    "nearest_area": [{"areaName": [{"value": "Benchville"}]}],
+}).encode()
+
+
+def fixture_path(source):
+    return os.path.join(FIXTURES, "hackernews.html" if source.parser == "hackernews" else f"{source.name}.xml")
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """/feeds/<source name> returns that source's fixture; /wttr/<anything> a fixed forecast."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.bodies = {}
+        for source in SOURCES:
+            with open(fixture_path(source), "rb") as f:
+                self.bodies[source.name] = f.read()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        kind, _, name = self.path.strip("/").partition("/")
+        body = self.server.bodies.get(name) if kind == "feeds" else WEATHER_BODY if kind == "wttr" else None
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json" if kind == "wttr" else "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def best_of(func, repeats=REPEATS):
+    """Fastest wall time of func() over repeats runs, and its last result."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def fixture_headlines():
+    headlines = []
+    for source in SOURCES:
+        with open(fixture_path(source), "rb") as f:
+            headlines += parse_source(source, f.read())
+    return headlines
+
+
+def corpus(n, seed=7):
+    """n headline dicts built from fixture vocabulary; ~20% reworded copies of earlier ones."""
+    rng = random.Random(seed)
+    base = fixture_headlines()
+    vocab = sorted({word for h in base for word in h["title"].split()} | set(agent.keywords))
+    sources = sorted({h["source"] for h in base})
+    titles = []
+    for _ in range(n):
+        if titles and rng.random() < 0.2:
+            words = rng.choice(titles).split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        else:
+            words = rng.sample(vocab, rng.randint(6, 14))
+        titles.append(" ".join(words))
+    return [
+        {
+            "title": title,
+            "link": f"https://example.com/{i}",
+            "source": rng.choice(sources),
+            "upvotes": rng.choice([None, rng.randint(0, 5000)]),
+            "comments": rng.choice([None, rng.randint(0, 800)]),
+        }
+        for i, title in enumerate(titles)
+    ]
+
+
+def scored(headlines):
+    now = datetime.utcnow()
+    analyzed = agent.score_and_classify_batch([h["title"] for h in headlines])
+    for h, (base_score, category) in zip(headlines, analyzed):
+        h["score"] = base_score + agent.engagement_score(h.get("upvotes"), h.get("comments"))
+        h["category"] = category
+        h["timestamp"] = now
+    return headlines
+
+
+def bench_stages(n, results):
+    headlines = corpus(n)
+    titles = [h["title"] for h in headlines]
+    upvotes = [h["upvotes"] for h in headlines]
+    comments = [h["comments"] for h in headlines]
+
+    stages = {
+        "score": lambda: agent.score_headlines_batch(titles, upvotes, comments),
+        "classify": lambda: agent.score_and_classify_batch(titles),
+        # Fresh dicts each run so featurization is part of the measurement
+        "dedup": lambda: agent.deduplicate_headlines([{"title": t} for t in titles]),
+    }
+    for stage, func in stages.items():
+        results[f"stage.{stage}.n={n}.seconds"], _ = best_of(func)
+
+    headlines = scored(headlines)
+    deduped = agent.deduplicate_headlines(headlines)
+    results[f"stage.sort.n={n}.seconds"], ordered = best_of(lambda: sorted(deduped, key=lambda h: h["score"], reverse=True))
+    results[f"stage.publish.n={n}.seconds"], _ = best_of(lambda: app.build_trending_payload(ordered))
+
+    def export():
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HeadlineStore(os.path.join(tmp, "headlines.db"))
+            store.upsert(ordered)
+            store.export_csv(os.path.join(tmp, "headlines.csv"))
+            store.close()
+    results[f"stage.export.n={n}.seconds"], _ = best_of(export)
+    results[f"stage.dedup.n={n}.kept_ratio"] = round(len(deduped) / n, 4)
+    return ordered
+
+
+async def load(client, paths, headers=None):
+    """Latency stats for HTTP_REQUESTS GETs over paths with HTTP_CONCURRENCY in flight."""
+    latencies = []
+    statuses = set()
+    queue = iter(range(HTTP_REQUESTS))
+
+    async def worker():
+        for i in queue:
+            start = time.perf_counter()
+            r = await client.get(paths[i % len(paths)], headers=headers)
+            latencies.append(time.perf_counter() - start)
+            statuses.add(r.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(HTTP_CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": round(HTTP_REQUESTS / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "status": sorted(statuses),
+    }
+
+
+async def bench_http(n, ordered, results):
+    app.limiter.enabled = False
+    app.publish_headlines(ordered)
+    rng = random.Random(n)
+    weather_paths = [
+        f"/weather?lat={rng.uniform(-60, 60):.4f}&lon={rng.uniform(-180, 180):.4f}" for _ in range(WEATHER_CELLS)
+    ]
+    weather.weather_cache.clear()
+
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        etag = (await client.get("/trending")).headers["etag"]
+        runs = {
+            "trending": (["/trending"], None),
+            "trending_gzip": (["/trending"], {"Accept-Encoding": "gzip"}),
+            "trending_page": (["/trending?category=general&limit=20", "/trending?min_score=5&limit=20"], None),
+            "trending_304": (["/trending"], {"If-None-Match": etag}),
+            "weather": (weather_paths, None),
+        }
+        for name, (paths, headers) in runs.items():
+            stats = await load(client, paths, headers)
+            for key in ("rps", "p50_ms", "p99_ms"):
+                results[f"http.{name}.n={n}.{key}"] = stats[key]
+            if any(status >= 400 for status in stats["status"]):
+                print(f"  warning: {name} answered {stats['status']}")
+
+
+async def bench_fetch(server, results):
+    sources = [dataclasses.replace(s, url=f"{server.base_url}/feeds/{s.name}", robots=False) for s in SOURCES]
+
+    times = []
+    for _ in range(REPEATS):
+        # A new scheduler each round, so every source is due right away
+        scheduler = PollScheduler()
+        for source in sources:
+            scheduler.add(source.name, async_scraper.make_poller(source), source.ttl)
+        start = time.perf_counter()
+        await scheduler.poll_due()
+        times.append(time.perf_counter() - start)
+    results["fetch.all_sources.seconds"] = min(times)
+    results["fetch.all_sources.items"] = len(scheduler.headlines())
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous_path, tolerance):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)["results"]
+    print(f"changes beyond {tolerance:.0%} against {previous_path}:")
+    for key, value in results.items():
+        old = previous.get(key)
+        if not old or not isinstance(value, (int, float)):
+            continue
+        ratio = value / old
+        higher_is_better = key.endswith(".rps")
+        worse = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+        better = ratio > 1 + tolerance if higher_is_better else ratio < 1 - tolerance
+        if worse or better:
+            print(f"  {'REGRESSED' if worse else 'improved':>9}  {key}: {old:g} -> {value:g} ({ratio:.2f}x)")
+
+
+async def run(sizes):
+    results = {}
+    server = FixtureServer()
+    # The stand-in is one local host; lift the per-host politeness limits for it
+    scraper.host_throttle = HostThrottle(rate_per_minute=10**9, burst=10**6)
+    weather.WEATHER_URL = server.base_url + "/wttr/{lat:.4f},{lon:.4f}"
+    async_scraper.open_client()
+    try:
+        await bench_fetch(server, results)
+        bodies = [(s, server.bodies[s.name]) for s in SOURCES]
+        results["parse.all_sources.seconds"], _ = best_of(lambda: [parse_source(s, body) for s, body in bodies])
+
+        if agent.headline_classifier.enabled:
+            agent.headline_classifier.load()  # Keep the one-off model load out of the stage timings
+        for n in sizes:
+            print(f"n={n}: stages")
+            ordered = bench_stages(n, results)
+            print(f"n={n}: http")
+            await bench_http(n, ordered, results)
+    finally:
+        await async_scraper.close_client()
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scrape -> serve benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", help="earlier output file to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.sizes))
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "results": {k: round(v, 6) if isinstance(v, float) else v for k, v in results.items()},
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    width = max(map(len, results))
+    for key, value in sorted(results.items()):
+        print(f"{key:<{width}}  {value:g}")
+    print(f"wrote {args.output}")
+    if args.compare:
+        compare(results, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
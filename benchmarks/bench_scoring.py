@@ -0,0 +1,59 @@
+"""Benchmark: score_headlines_batch vs a score_headline loop.
+
+Times re-scoring every row of headlines.csv repeated up to REPEAT_TO rows,
+with random engagement counts. tests/test_scoring.py checks that the two
+agree.
+
+Run from the repo root:  python benchmarks/bench_scoring.py
+"""
+import csv
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import score_headline, score_headlines_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT_TO = 100_000
+
+
+def load_rows():
+    """(title, upvotes) per headlines.csv row; the score column stands in for upvotes."""
+    with open(os.path.join(ROOT, "headlines.csv"), encoding="utf-8") as f:
+        return [(row[0], int(row[3]) if row[3].lstrip("-").isdigit() else None) for row in csv.reader(f) if row]
+
+
+def random_count(rng):
+    return rng.choice([
+        None, 0, rng.randint(1, 60), rng.randint(-500, -1), rng.randint(0, 10**9),
+        rng.uniform(0, 5000), rng.randint(0, 10**18),
+    ])
+
+
+def main():
+    rng = random.Random(7)
+    rows = load_rows()
+    rows = (rows * (REPEAT_TO // len(rows) + 1))[:REPEAT_TO]
+    titles = [title for title, _ in rows]
+    upvotes = [votes for _, votes in rows]
+    comments = [random_count(rng) for _ in rows]
+    views = [random_count(rng) for _ in rows]
+
+    def scalar():
+        return [score_headline(t, u, c, v) for t, u, c, v in zip(titles, upvotes, comments, views)]
+
+    def batch():
+        return score_headlines_batch(titles, upvotes, comments, views)
+
+    assert batch().tolist() == scalar()
+    print(f"re-scoring {len(titles)} headlines.csv rows")
+    for name, func in [("score_headline", scalar), ("batch", batch)]:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"  {name:>14}: {seconds:6.3f}s ({seconds / len(titles) * 1e6:6.2f} us/title)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Local stand-in for the OneSignal notifications API.
+
+Records every POST and can answer the first N with 503 (plus Retry-After)
+or delay each response, to exercise notifications.Notifier offline:
+
+    python benchmarks/fake_onesignal.py --port 8025 --fail-first 2
+    ONESIGNAL_URL=http://127.0.0.1:8025/api/v1/notifications ONESIGNAL_API_KEY=fake uvicorn app:app
+
+With --check it instead drives a Notifier against itself and reports what
+arrived: the retries, the coalescing of queued alerts and the dedupe of a
+repeated headline.
+
+tests/test_notifications.py runs the same server under pytest.
+
+Run from the repo root:  python benchmarks/fake_onesignal.py --check
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeOneSignal(ThreadingHTTPServer):
+    def __init__(self, port=0, fail_first=0, delay=0.0, retry_after=None):
+        super().__init__(("127.0.0.1", port), FakeOneSignalHandler)
+        self.fail_first = fail_first
+        self.delay = delay
+        self.retry_after = retry_after
+        self.attempts = 0
+        self.attempt_times = []  # time.monotonic() of each request, in arrival order
+        self.received = []  # Payloads answered with 200
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v1/notifications"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class FakeOneSignalHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        time.sleep(server.delay)
+        with server.lock:
+            server.attempts += 1
+            server.attempt_times.append(time.monotonic())
+            failing = server.attempts <= server.fail_first
+            if not failing:
+                server.received.append(payload)
+
+        if failing:
+            self.send_response(503)
+            if server.retry_after is not None:
+                self.send_header("Retry-After", str(server.retry_after))
+            body = b'{"errors":["unavailable"]}'
+        else:
+            self.send_response(200)
+            body = json.dumps({"id": f"fake-{len(server.received)}", "recipients": 1}).encode()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def check():
+    import async_scraper
+    import notifications
+    from notifications import Notifier
+
+    notifications.NOTIFY_BACKOFF = 0.05
+    server = FakeOneSignal(fail_first=2, delay=0.2).start()
+    async_scraper.open_client()
+    notifier = Notifier(url=server.url, api_key="fake")
+    notifier.start()
+    try:
+        started = time.perf_counter()
+        for score in (21, 35, 28):
+            notifier.enqueue({"title": f"Story scoring {score}", "link": "https://example.com", "score": score})
+        enqueue_ms = (time.perf_counter() - started) * 1000
+        while notifier.sent + notifier.failed < 1:
+            await asyncio.sleep(0.05)
+        repeated = notifier.enqueue({"title": "Story scoring 21", "score": 21})
+        await asyncio.sleep(0.5)
+        while notifier.queue.qsize() or notifier.pending:
+            await asyncio.sleep(0.05)
+    finally:
+        await notifier.stop()
+        await async_scraper.close_client()
+        server.shutdown()
+
+    print(f"enqueue of 3 alerts took {enqueue_ms:.2f} ms")
+    print(f"attempts: {server.attempts}, delivered: {[p['contents']['en'] for p in server.received]}")
+    print(f"re-enqueue of a coalesced story accepted: {repeated}; sent {notifier.sent}, failed {notifier.failed}")
+    duplicate = notifier.enqueue({"title": server.received[0]["contents"]["en"]}) if server.received else None
+    print(f"re-enqueue of a delivered story accepted: {duplicate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-first", type=int, default=0, help="answer the first N posts with 503")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with each 503")
+    parser.add_argument("--check", action="store_true", help="run a Notifier against a private instance")
+    args = parser.parse_args()
+
+    if args.check:
+        asyncio.run(check())
+        return
+    server = FakeOneSignal(args.port, args.fail_first, args.delay, args.retry_after)
+    print(f"Fake OneSignal listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"{server.attempts} attempts, {len(server.received)} notifications accepted")
+
+
+if __name__ == "__main__":
+    main()
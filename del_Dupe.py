@@ -1,36 +1,149 @@
+import argparse
 import csv
+import hashlib
+import math
 import os
+import sqlite3
+import tempfile
 
-def remove_duplicate_rows(input_file, output_file):
-    seen = set()
+# Rows are remembered as fixed-size digests, never as tuples, and the file
+# is streamed, so memory only grows with the number of distinct rows (or
+# stays fixed with --seen bloom).
+BLOOM_ERROR_RATE = 0.001
 
-    with open(input_file, 'r', newline='', encoding='utf-8') as infile:
-        reader = csv.reader(infile)
-        rows = list(reader)
+def row_digest(row):
+    """16-byte blake2b of a row; fields are length-prefixed so no two rows share an encoding."""
+    encoded = "".join(f"{len(field)}:{field}" for field in row).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).digest()
 
-        if not rows:
-            print("The file is empty.")
-            return
+class MemorySeen:
+    """Set of 64-bit row hashes."""
 
-        # Separate header and data rows
-        header = rows[0]
-        data_rows = rows[1:]
+    def __init__(self):
+        self.hashes = set()
 
-        # Deduplicate
-        unique_rows = []
-        for row in data_rows:
-            row_tuple = tuple(row)
-            if row_tuple not in seen:
-                seen.add(row_tuple)
-                unique_rows.append(row)
+    def add(self, digest):
+        """True if digest was not seen before."""
+        key = int.from_bytes(digest[:8], "big")
+        if key in self.hashes:
+            return False
+        self.hashes.add(key)
+        return True
 
-    # Write results
-    with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-        writer = csv.writer(outfile)
-        writer.writerow(header)
-        writer.writerows(unique_rows)
+    def close(self):
+        self.hashes.clear()
 
-    print(f"Deduplication complete. {len(data_rows) - len(unique_rows)} duplicates removed.")
+class DiskSeen:
+    """64-bit row hashes in a temporary SQLite table, for archives bigger than memory."""
 
-# Example usage
-remove_duplicate_rows('headlines.csv', 'headlines.csv')
+    def __init__(self, directory=None):
+        fd, self.path = tempfile.mkstemp(suffix=".seen.db", dir=directory)
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE seen (hash INTEGER PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, digest):
+        key = int.from_bytes(digest[:8], "big", signed=True)
+        return self.conn.execute("INSERT OR IGNORE INTO seen VALUES (?)", (key,)).rowcount == 1
+
+    def close(self):
+        self.conn.close()
+        os.remove(self.path)
+
+class BloomSeen:
+    """Fixed-size Bloom filter sized for capacity rows.
+
+    Never keeps a duplicate, but may drop a unique row with probability
+    about error_rate, so use it only where that loss is acceptable.
+    """
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, digest):
+        # Double hashing: the i-th probe is h1 + i * h2
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        new = False
+        for i in range(self.hash_count):
+            bit = (h1 + i * h2) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        return new
+
+    def close(self):
+        self.bits = bytearray()
+
+def make_seen(mode="memory", capacity=None, directory=None):
+    if mode == "memory":
+        return MemorySeen()
+    if mode == "disk":
+        return DiskSeen(directory)
+    if mode == "bloom":
+        if not capacity:
+            raise ValueError("bloom mode needs the expected number of rows (capacity)")
+        return BloomSeen(capacity)
+    raise ValueError(f"unknown mode {mode!r}")
+
+def remove_duplicate_rows(input_file, output_file, mode="memory", capacity=None):
+    """Copy input_file to output_file without repeated rows, keeping the header.
+
+    Rows are streamed and the output is written to a temporary file that
+    replaces output_file at the end, so input_file may be output_file.
+    Returns the number of rows dropped.
+    """
+    directory = os.path.dirname(os.path.abspath(output_file))
+    seen = make_seen(mode, capacity, directory)
+    tmp_path = None
+    try:
+        with open(input_file, 'r', newline='', encoding='utf-8') as infile:
+            reader = csv.reader(infile)
+            header = next(reader, None)
+
+            if header is None:
+                print("The file is empty.")
+                return 0
+
+            fd, tmp_path = tempfile.mkstemp(suffix=".csv.tmp", dir=directory)
+            removed = 0
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(header)
+                for row in reader:
+                    if seen.add(row_digest(row)):
+                        writer.writerow(row)
+                    else:
+                        removed += 1
+
+        # mkstemp creates the file 0600; give the result the input's permissions
+        os.chmod(tmp_path, os.stat(input_file).st_mode & 0o7777)
+        os.replace(tmp_path, output_file)
+        tmp_path = None
+    finally:
+        seen.close()
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
+    print(f"Deduplication complete. {removed} duplicates removed.")
+    return removed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drop repeated rows from a CSV file, keeping its header.")
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", help="defaults to rewriting the input in place")
+    parser.add_argument("--seen", choices=["memory", "disk", "bloom"], default="memory",
+                        help="where row hashes are kept (default: %(default)s)")
+    parser.add_argument("--capacity", type=int, help="expected row count, required for --seen bloom")
+    args = parser.parse_args(argv)
+    if args.seen == "bloom" and not args.capacity:
+        parser.error("--seen bloom needs --capacity")
+    remove_duplicate_rows(args.input, args.output or args.input, args.seen, args.capacity)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# features.py - Shared TF-IDF featurization for headlines
+#
+# Titles are hashed into a fixed feature space, so no vocabulary has to be
+# fitted per batch. Document frequencies accumulate across calls, once per
+# distinct title, and each title's hashed term counts are kept for
+# FEATURE_TTL, so re-fetched copies of a story are not re-tokenized.
+# Headline dicts also carry theirs under "features".
+
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from seen_stories import SEEN_TTL
+
+HASH_FEATURES = 2**20  # Collisions stay rare for a headline-sized vocabulary
+FEATURE_TTL = SEEN_TTL  # A story absent this long counts as a new document again
+FEATURE_CACHE_SIZE = 100_000
+
+class TextFeatures:
+    """HashingVectorizer term counts plus running document frequencies.
+
+    tfidf() matches TfidfVectorizer(stop_words="english") weighting (smooth
+    idf, l2 rows), except that idf comes from every headline featurized so
+    far rather than from the current batch alone. Each distinct title
+    counts as one document however often it is fetched.
+    """
+
+    def __init__(self, n_features=HASH_FEATURES, ttl=FEATURE_TTL, max_stories=FEATURE_CACHE_SIZE):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, stop_words="english", alternate_sign=False, norm=None,
+        )
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.documents = 0
+        self.stories = TTLCache(maxsize=max_stories, ttl=ttl)  # exact title -> (indices, data)
+        self.lock = threading.Lock()
+
+    def transform(self, texts):
+        """Raw hashed term counts for texts, without touching the statistics."""
+        return self.vectorizer.transform(texts)
+
+    def counts(self, headlines):
+        """Term counts for headlines, featurizing only stories not seen before."""
+        missing = [h for h in headlines if "features" not in h]
+        if missing:
+            # Keyed on the exact title: anything coarser could merge different stories
+            known = {}
+            fresh = []  # Titles never featurized, first copy wins
+            with self.lock:
+                for h in missing:
+                    title = h["title"]
+                    features = self.stories.get(title)
+                    if features is not None:
+                        self.stories[title] = known[title] = features  # Renews its TTL
+                    elif title not in known:
+                        known[title] = None
+                        fresh.append(title)
+
+            if fresh:
+                matrix = self.transform(fresh)
+                for title, start, end in zip(fresh, matrix.indptr[:-1], matrix.indptr[1:]):
+                    known[title] = (matrix.indices[start:end], matrix.data[start:end])
+                with self.lock:
+                    # Each row holds a term at most once, so this counts documents
+                    self.doc_freq += np.bincount(matrix.indices, minlength=len(self.doc_freq))
+                    self.documents += len(fresh)
+                    for title in fresh:
+                        self.stories[title] = known[title]
+
+            for h in missing:
+                h["features"] = known[h["title"]]
+
+        lengths = [len(h["features"][0]) for h in headlines]
+        indptr = np.r_[0, np.cumsum(lengths)]
+        indices = np.concatenate([h["features"][0] for h in headlines]) if headlines else np.empty(0, dtype=np.int32)
+        data = np.concatenate([h["features"][1] for h in headlines]) if headlines else np.empty(0)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(headlines), len(self.doc_freq)))
+
+    def idf(self):
+        with self.lock:
+            return np.log((1 + self.documents) / (1 + self.doc_freq)) + 1
+
+    def weigh(self, counts):
+        """l2-normalized TF-IDF rows for a count matrix from counts() or transform()."""
+        return normalize(counts @ sparse.diags(self.idf()), norm="l2", copy=False).tocsr()
+
+    def tfidf(self, headlines):
+        return self.weigh(self.counts(headlines))
+
+text_features = TextFeatures()
@@ -0,0 +1,200 @@
+# headline_store.py - SQLite history of every headline Pulse has published
+#
+# Each scrape cycle upserts its headlines keyed on the normalized title, so
+# a cycle costs O(its own rows) however long the history grows. CSV/Parquet
+# files are produced on demand:
+#
+#   python headline_store.py export headlines.csv
+#   python headline_store.py export headlines.parquet --format parquet
+#   python headline_store.py import headlines.csv     # backfill old exports
+
+import argparse
+import csv
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from seen_stories import normalize_link, title_fingerprint
+
+HEADLINE_DB_PATH = os.getenv("HEADLINE_DB_PATH", "headlines.db")
+EXPORT_COLUMNS = ["title", "category", "source", "score", "timestamp"]
+EXPORT_BATCH = 10_000  # Rows fetched per cursor step while exporting
+SCHEMA_VERSION = 1  # 1: title_key from the script-aware title_fingerprint
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headlines (
+    title_key  TEXT PRIMARY KEY,  -- seen_stories.title_fingerprint(title)
+    link_key   TEXT,              -- seen_stories.normalize_link(link)
+    title      TEXT NOT NULL,
+    link       TEXT,
+    source     TEXT,
+    category   TEXT,
+    score      REAL,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS headlines_link_key ON headlines (link_key);
+CREATE INDEX IF NOT EXISTS headlines_first_seen ON headlines (first_seen);
+"""
+
+UPSERT = """
+INSERT INTO headlines (title_key, link_key, title, link, source, category, score, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (title_key) DO UPDATE SET
+    link_key = COALESCE(excluded.link_key, link_key),
+    link = COALESCE(excluded.link, link),
+    category = excluded.category,
+    score = COALESCE(excluded.score, score),
+    last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+def as_text(timestamp):
+    if isinstance(timestamp, datetime):
+        return timestamp.isoformat()
+    return timestamp or datetime.utcnow().isoformat()
+
+class HeadlineStore:
+    """One row per story; a story seen again only has its score and last_seen moved."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            self.migrate(self.conn)
+        return self.conn
+
+    def migrate(self, conn):
+        """Bring an older database up to SCHEMA_VERSION."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with conn:
+            # Version 0 keyed every non-Latin title alike; re-key the rows that survived
+            rows = conn.execute("SELECT rowid, title, title_key FROM headlines").fetchall()
+            rekeyed = [(title_fingerprint(title), rowid) for rowid, title, key in rows if title_fingerprint(title) != key]
+            conn.executemany("UPDATE OR IGNORE headlines SET title_key = ? WHERE rowid = ?", rekeyed)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if rekeyed:
+            logger.info(f"Re-keyed {len(rekeyed)} headlines in {self.path}")
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def upsert(self, headlines):
+        """Insert new stories and refresh known ones in a single transaction."""
+        rows = [
+            (
+                title_fingerprint(h["title"]), normalize_link(h.get("link")), h["title"], h.get("link"),
+                h.get("source", "Unknown"), h.get("category", "General"), h.get("score"),
+                as_text(h.get("timestamp")), as_text(h.get("timestamp")),
+            )
+            for h in headlines
+        ]
+        with self.lock, self.connect() as conn:
+            conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def __len__(self):
+        with self.lock:
+            return self.connect().execute("SELECT COUNT(*) FROM headlines").fetchone()[0]
+
+    def iter_rows(self):
+        """EXPORT_COLUMNS tuples, oldest story first, streamed from the database."""
+        with self.lock:
+            cursor = self.connect().execute(
+                "SELECT title, category, source, score, first_seen FROM headlines ORDER BY first_seen, rowid"
+            )
+            rows = cursor.fetchmany(EXPORT_BATCH)
+        while rows:
+            yield from rows
+            with self.lock:
+                rows = cursor.fetchmany(EXPORT_BATCH)
+
+    def export_csv(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(self.iter_rows())
+        os.replace(tmp_path, path)
+
+    def export_parquet(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+        schema = pa.schema([(name, pa.float64() if name == "score" else pa.string()) for name in EXPORT_COLUMNS])
+        tmp_path = f"{path}.tmp"
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            batch = []
+            for row in self.iter_rows():
+                batch.append(row)
+                if len(batch) == EXPORT_BATCH:
+                    writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, r)) for r in batch], schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, r)) for r in batch], schema))
+        os.replace(tmp_path, path)
+
+    def import_csv(self, path):
+        """Backfill from a headlines.csv written by the old exporter (header optional)."""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [row for row in csv.reader(f) if row and row[0] != "title"]
+        headlines = [
+            {
+                "title": row[0],
+                "category": row[1] if len(row) > 1 and row[1] else "General",
+                "source": row[2] if len(row) > 2 and row[2] else "Unknown",
+                "score": float(row[3]) if len(row) > 3 and row[3] else None,
+                "timestamp": row[4] if len(row) > 4 and row[4] else None,
+            }
+            for row in rows
+        ]
+        return self.upsert(headlines)
+
+headline_store = HeadlineStore(HEADLINE_DB_PATH)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or backfill the Pulse headline history.")
+    parser.add_argument("--db", default=HEADLINE_DB_PATH, help="SQLite file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write every stored headline to a file")
+    export.add_argument("path")
+    export.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    backfill = commands.add_parser("import", help="upsert rows from an old headlines.csv")
+    backfill.add_argument("path")
+    args = parser.parse_args(argv)
+
+    store = HeadlineStore(args.db)
+    try:
+        if args.command == "export":
+            if args.format == "parquet":
+                store.export_parquet(args.path)
+            else:
+                store.export_csv(args.path)
+            print(f"Exported {len(store)} headlines to {args.path}")
+        else:
+            count = store.import_csv(args.path)
+            print(f"Imported {count} rows from {args.path}; {len(store)} headlines stored")
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
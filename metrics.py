@@ -0,0 +1,33 @@
+# metrics.py - Prometheus metrics for the scrape pipeline
+#
+# Exposed on /metrics next to the HTTP metrics from
+# prometheus_fastapi_instrumentator; each uvicorn worker reports its own.
+
+from prometheus_client import Counter, Gauge, Histogram
+
+SOURCE_FETCH_SECONDS = Histogram(
+    "pulse_source_fetch_seconds", "Time to fetch and parse one source",
+    ["source", "status"], buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30),
+)
+SOURCE_BYTES = Counter("pulse_source_bytes_total", "Response body bytes downloaded per source", ["source"])
+SOURCE_ITEMS = Counter("pulse_source_items_total", "Headlines parsed per source", ["source"])
+SOURCE_POLL_INTERVAL = Gauge("pulse_source_poll_interval_seconds", "Current adaptive polling interval per source", ["source"])
+CACHE_REQUESTS = Counter("pulse_cache_requests_total", "Cache lookups by cache and result", ["cache", "result"])
+
+STAGE_SECONDS = Histogram(
+    "pulse_stage_seconds", "Time spent in each scrape cycle stage", ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+CYCLE_SECONDS = Histogram(
+    "pulse_scrape_cycle_seconds", "Duration of each poll round, including any rebuild it triggers",
+    buckets=(1, 2.5, 5, 10, 20, 30, 45, 60, 120),
+)
+CYCLE_ERRORS = Counter("pulse_scrape_cycle_errors_total", "Scrape cycles that raised")
+HEADLINES_FETCHED = Gauge("pulse_headlines_fetched", "Raw headlines in the last cycle")
+HEADLINES_PUBLISHED = Gauge("pulse_headlines_published", "Headlines behind /trending")
+DEDUP_RATIO = Gauge("pulse_dedup_ratio", "Share of the last cycle's headlines dropped as near-duplicates")
+NOTIFICATIONS = Counter("pulse_notifications_total", "Push notifications by outcome", ["result"])
+TRENDING_AGE = Gauge("pulse_trending_age_seconds", "Seconds since the data behind /trending was scraped")
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
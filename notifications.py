@@ -0,0 +1,160 @@
+# notifications.py - Background OneSignal pushes for breaking headlines
+#
+# The scrape loop only calls notifier.enqueue(); one worker task drains the
+# queue, coalescing whatever piled up into a single push for the best story,
+# and retries failed pushes with exponential backoff. Stories already pushed
+# within NOTIFY_DEDUPE_TTL, or being pushed, are not pushed again. Without
+# ONESIGNAL_API_KEY in the environment notifications are disabled.
+
+import asyncio
+import logging
+import os
+import random
+
+from cachetools import TTLCache
+
+import async_scraper
+from metrics import NOTIFICATIONS
+from scraper import retry_after_seconds
+from seen_stories import title_fingerprint
+
+ONESIGNAL_URL = os.getenv("ONESIGNAL_URL", "https://onesignal.com/api/v1/notifications")
+ONESIGNAL_APP_ID = os.getenv("ONESIGNAL_APP_ID", "ccebf6b2-767a-4fe8-ad2a-a2a2a2f66adc")
+ONESIGNAL_API_KEY = os.getenv("ONESIGNAL_API_KEY")  # REST API key; never commit it
+
+NOTIFY_QUEUE_SIZE = 100
+NOTIFY_TIMEOUT = 10  # Seconds per push attempt
+NOTIFY_MAX_ATTEMPTS = 5
+NOTIFY_BACKOFF = 2  # First retry delay; doubles per attempt, with jitter
+NOTIFY_BACKOFF_MAX = 300
+NOTIFY_DEDUPE_TTL = 24 * 3600
+
+logger = logging.getLogger(__name__)
+
+def build_payload(headline):
+    return {
+        "app_id": ONESIGNAL_APP_ID,
+        "included_segments": ["All"],
+        "headings": {"en": "📢 Breaking News"},
+        "contents": {"en": headline.get("title", "No title")},
+        "url": headline.get("link", "https://pulse.news"),
+    }
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff before retry number attempt (1-based)."""
+    return random.uniform(0, min(NOTIFY_BACKOFF_MAX, NOTIFY_BACKOFF * 2 ** (attempt - 1)))
+
+class RetryableError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class Notifier:
+    """Bounded queue plus one worker task; the producer never waits on the network."""
+
+    def __init__(self, url=ONESIGNAL_URL, api_key=ONESIGNAL_API_KEY, max_queue=NOTIFY_QUEUE_SIZE,
+                 dedupe_ttl=NOTIFY_DEDUPE_TTL):
+        self.url = url
+        self.api_key = api_key
+        self.max_queue = max_queue
+        self.queue = None
+        self.worker = None
+        self.notified = TTLCache(maxsize=10_000, ttl=dedupe_ttl)  # fingerprint -> True once pushed
+        self.pending = set()  # fingerprints queued or being pushed, until sent or given up
+        self.sent = 0
+        self.failed = 0
+
+    def start(self):
+        if not self.api_key:
+            logger.warning("ONESIGNAL_API_KEY is not set, push notifications are disabled")
+            return
+        self.queue = asyncio.Queue(self.max_queue)
+        self.worker = asyncio.create_task(self.run(), name="notifier")
+
+    async def stop(self):
+        if self.worker:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        if self.queue and self.queue.qsize():
+            logger.warning(f"Dropping {self.queue.qsize()} queued notifications on shutdown")
+
+    def enqueue(self, headline):
+        """Queue a push for headline unless it was pushed recently; never blocks."""
+        if self.queue is None:
+            NOTIFICATIONS.labels("disabled").inc()
+            return False
+        fingerprint = title_fingerprint(headline.get("title"))
+        if fingerprint in self.notified or fingerprint in self.pending:
+            NOTIFICATIONS.labels("duplicate").inc()
+            return False
+        try:
+            self.queue.put_nowait((fingerprint, headline))
+        except asyncio.QueueFull:
+            logger.warning("Notification queue full, dropping alert")
+            NOTIFICATIONS.labels("dropped").inc()
+            return False
+        self.pending.add(fingerprint)
+        return True
+
+    def drain(self, first):
+        """first plus everything else already queued, best score first."""
+        batch = [first]
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        batch.sort(key=lambda item: item[1].get("score", 0), reverse=True)
+        return batch
+
+    async def run(self):
+        while True:
+            batch = self.drain(await self.queue.get())
+            # Coalesce: one push for the best story; the rest may come back next cycle
+            fingerprint, headline = batch[0]
+            self.pending.difference_update(fp for fp, _ in batch[1:])
+            NOTIFICATIONS.labels("coalesced").inc(len(batch) - 1)
+            try:
+                # Stays pending while in flight, so a re-enqueue can't push it twice
+                if await self.send(headline):
+                    self.notified[fingerprint] = True
+            finally:
+                self.pending.discard(fingerprint)
+
+    async def send(self, headline):
+        """Push one headline, retrying transient failures; True once OneSignal accepts it."""
+        for attempt in range(1, NOTIFY_MAX_ATTEMPTS + 1):
+            try:
+                await self.post(build_payload(headline))
+                self.sent += 1
+                NOTIFICATIONS.labels("sent").inc()
+                logger.info("🔔 Notification sent")
+                return True
+            except RetryableError as e:
+                if attempt == NOTIFY_MAX_ATTEMPTS:
+                    break
+                delay = e.retry_after if e.retry_after is not None else backoff_delay(attempt)
+                logger.warning(f"[OneSignal Error] {e}; retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(min(delay, NOTIFY_BACKOFF_MAX))
+            except Exception as e:
+                logger.error(f"[OneSignal Error] {e}")
+                break
+        self.failed += 1
+        NOTIFICATIONS.labels("failed").inc()
+        return False
+
+    async def post(self, payload):
+        headers = {
+            "Authorization": f"Basic {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        try:
+            r = await async_scraper.client.post(self.url, json=payload, headers=headers, timeout=NOTIFY_TIMEOUT)
+        except Exception as e:  # Timeouts and connection errors are worth retrying
+            raise RetryableError(f"{type(e).__name__}: {e}")
+        if r.status_code == 429 or r.status_code >= 500:
+            raise RetryableError(f"HTTP {r.status_code}", retry_after_seconds(r.headers))
+        r.raise_for_status()
+
+notifier = Notifier()
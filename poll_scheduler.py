@@ -0,0 +1,136 @@
+# poll_scheduler.py - When each source is polled next
+#
+# Every source starts at its registry ttl. After each successful poll its
+# interval moves toward the time the source takes to produce POLL_TARGET_NEW
+# new stories, going by a smoothed new-stories-per-second rate, so busy feeds
+# are polled more often and quiet ones less. Failures back off exponentially
+# (with jitter) and leave the rate and the last good headlines alone.
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+
+from async_scraper import POLLERS, fetch_twitter_trending, timed_fetch
+from metrics import SOURCE_POLL_INTERVAL
+from scraper import CACHE_TTL
+from seen_stories import title_fingerprint
+from sources import SOURCES
+
+POLL_MIN_INTERVAL = 60
+POLL_MAX_INTERVAL = 3600
+POLL_TARGET_NEW = 3  # New stories a poll should find at the source's usual rate
+POLL_SMOOTHING = 0.3  # Weight of the latest poll in the rate estimate
+POLL_MAX_GROWTH = 2  # An interval at most doubles per quiet poll
+POLL_ERROR_BACKOFF = 30  # First retry after a failure; doubles per consecutive failure
+
+logger = logging.getLogger(__name__)
+
+def clamp_interval(seconds):
+    return max(POLL_MIN_INTERVAL, min(POLL_MAX_INTERVAL, seconds))
+
+class SourceSchedule:
+    """Polling state of one source: its interval, next due time and last good headlines."""
+
+    def __init__(self, name, fetch, interval):
+        self.name = name
+        self.fetch = fetch
+        self.interval = clamp_interval(interval)
+        self.next_due = 0.0  # Monotonic time; 0 means poll right away
+        self.last_polled = None
+        self.rate = None  # Smoothed new stories per second, None until the second poll
+        self.errors = 0  # Consecutive failed polls
+        self.fingerprints = None  # Title fingerprints from the last successful poll
+        self.headlines = []
+        SOURCE_POLL_INTERVAL.labels(name).set(self.interval)
+
+    def record_success(self, headlines, now):
+        """Keep this poll's headlines and schedule the next; returns how many are new."""
+        fingerprints = {title_fingerprint(h.get("title")) for h in headlines}
+        if self.fingerprints is None:
+            new = len(fingerprints)
+        else:
+            new = len(fingerprints - self.fingerprints)
+            observed = new / max(now - self.last_polled, 1)
+            self.rate = observed if self.rate is None else (
+                POLL_SMOOTHING * observed + (1 - POLL_SMOOTHING) * self.rate)
+            target = POLL_TARGET_NEW / self.rate if self.rate else POLL_MAX_INTERVAL
+            self.interval = clamp_interval(min(target, self.interval * POLL_MAX_GROWTH))
+            SOURCE_POLL_INTERVAL.labels(self.name).set(self.interval)
+
+        self.errors = 0
+        self.last_polled = now
+        self.fingerprints = fingerprints
+        self.headlines = headlines
+        self.next_due = now + self.interval
+        return new
+
+    def record_failure(self, now):
+        """Back off before the next attempt; the last good headlines stay published."""
+        self.errors += 1
+        delay = min(POLL_MAX_INTERVAL, POLL_ERROR_BACKOFF * 2 ** (self.errors - 1))
+        self.next_due = now + random.uniform(delay / 2, delay)
+        logger.warning(f"{self.name} failed {self.errors} time(s) in a row, "
+                       f"next poll in {self.next_due - now:.0f}s")
+
+class PollScheduler:
+    def __init__(self):
+        self.schedules = {}
+
+    def add(self, name, fetch, interval):
+        self.schedules[name] = SourceSchedule(name, fetch, interval)
+
+    def due(self, now):
+        return [s for s in self.schedules.values() if s.next_due <= now]
+
+    async def poll_due(self):
+        """Fetch every due source concurrently and record the outcomes.
+
+        Returns ({source: timing}, new stories across them); each headline
+        is stamped with the time it was fetched.
+        """
+        due = self.due(time.monotonic())
+        results = await asyncio.gather(*(timed_fetch(s.fetch) for s in due))
+        polled_at, now = time.monotonic(), datetime.utcnow()
+        timings = {}
+        new_stories = 0
+        for schedule, (result, timing) in zip(due, results):
+            timings[schedule.name] = timing
+            if timing["status"] != "ok":
+                schedule.record_failure(polled_at)
+                continue
+            for h in result:
+                h["timestamp"] = now
+            timing["new"] = schedule.record_success(result, polled_at)
+            timing["next_poll"] = round(schedule.interval)
+            new_stories += timing["new"]
+        return timings, new_stories
+
+    def next_due(self):
+        return min((s.next_due for s in self.schedules.values()), default=None)
+
+    def clear(self):
+        """Forget every source's headlines and poll them again right away.
+
+        Fingerprints go too, so the next poll counts every story as new and
+        republishes, however quiet the source. Intervals and rates stay, and
+        a source backing off after errors keeps its retry time.
+        """
+        for schedule in self.schedules.values():
+            schedule.headlines = []
+            schedule.fingerprints = None
+            if not schedule.errors:
+                schedule.next_due = 0.0
+
+    def headlines(self):
+        """Every source's latest good headlines, merged."""
+        merged = []
+        for schedule in self.schedules.values():
+            merged += schedule.headlines
+        return merged
+
+poll_scheduler = PollScheduler()
+for source in SOURCES:
+    poll_scheduler.add(source.name, POLLERS[source.name], source.ttl)
+poll_scheduler.add("twitter_trending", fetch_twitter_trending, CACHE_TTL)
@@ -1,19 +1,33 @@
 import requests
 from bs4 import BeautifulSoup
+import feedparser
+import io
+import json
 import logging
+import os
 import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 from cachetools import cached, TTLCache
+from lxml import etree
 from requests.exceptions import RequestException, Timeout, TooManyRedirects
+from sources import SOURCES
 
 # --- Configuration ---
-RATE_LIMIT = 100  # Not currently enforced, just a placeholder
-REQUEST_DELAY = (1, 3)  # Delay range in seconds between requests
+RATE_LIMIT = 100  # Max requests per minute to any single host
+RATE_BURST = 5  # Requests a host may receive back-to-back before pacing kicks in
 REQUEST_TIMEOUT = (3.05, 10)  # Connect timeout, read timeout
 MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10 MB max
+READ_CHUNK_SIZE = 64 * 1024  # Bytes pulled off the socket per read when streaming
 CACHE_TTL = 300  # 5 minutes
+SOURCE_DEADLINE = 30  # Seconds a single source may take per scrape cycle
+ROBOTS_TTL = 3600  # Reuse a parsed robots.txt for an hour unless Cache-Control says otherwise
+ROBOTS_ERROR_TTL = 300  # Back off this long after robots.txt could not be fetched
+VALIDATOR_STORE_PATH = os.getenv("FEED_VALIDATOR_PATH", "feed_validators.json")
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
@@ -31,80 +45,246 @@ session = requests.Session()
 
 # --- Cache ---
 cache = TTLCache(maxsize=100, ttl=CACHE_TTL)
-google_cache = TTLCache(maxsize=100, ttl=CACHE_TTL)
-reddit_cache = TTLCache(maxsize=100, ttl=600)
-hn_cache=TTLCache(maxsize=100, ttl=CACHE_TTL)
-ycomb_cache=TTLCache(maxsize=100, ttl=1200)
-yahoo_cache=TTLCache(maxsize=100, ttl=1200)
-espn_cache=TTLCache(maxsize=100, ttl=1200)
+
+# --- Conditional GET ---
+class FeedValidatorStore:
+    """ETag/Last-Modified validators and the last parsed headlines, keyed by URL.
+
+    Lets a fetcher send If-None-Match / If-Modified-Since and reuse the
+    previous parse on a 304 instead of downloading and parsing the feed again.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def headers_for(self, url):
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def headlines_for(self, url):
+        entry = self.entries.get(url) or {}
+        # Hand out copies: the scrape loop annotates headline dicts in place
+        return [dict(h) for h in entry.get("headlines", [])]
+
+    def remember(self, url, response_headers, headlines):
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        with self.lock:
+            if not etag and not last_modified:
+                # Nothing to revalidate with next time
+                if self.entries.pop(url, None) is not None:
+                    self.dirty = True
+                return
+            self.entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "headlines": [dict(h) for h in headlines],
+            }
+            self.dirty = True
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load feed validators from {self.path}: {e}")
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        with self.lock:
+            snapshot = json.dumps(self.entries)
+            self.dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+
+feed_validators = FeedValidatorStore(VALIDATOR_STORE_PATH)
 
 # --- Utility Functions ---
 def get_random_user_agent():
     return random.choice(USER_AGENTS)
 
-def rate_limited_request(url, headers=None):
-    """Make a GET request with delay, random User-Agent, and timeout."""
-    time.sleep(random.uniform(*REQUEST_DELAY))  # Respectful scraping
+class HostThrottle:
+    """Per-host token buckets; a caller only ever waits on its own host.
+
+    reserve() takes a token and returns how long to wait before sending, so
+    the same bucket works for blocking and async callers. Crawl-delay from
+    robots.txt slows a host down further, and Retry-After blocks it outright.
+    """
+
+    def __init__(self, rate_per_minute=RATE_LIMIT, burst=RATE_BURST):
+        self.interval = 60 / rate_per_minute
+        self.burst = burst
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def reserve(self, host, crawl_delay=None):
+        with self.lock:
+            now = time.monotonic()
+            state = self.hosts.setdefault(host, {"tokens": self.burst, "updated": now, "blocked_until": 0})
+            interval = max(self.interval, crawl_delay or 0)
+            capacity = 1 if crawl_delay else self.burst
+
+            # Refill, then take a token; a negative balance is a queue of waiters
+            state["tokens"] = min(capacity, state["tokens"] + (now - state["updated"]) / interval) - 1
+            state["updated"] = now
+
+            wait = max(0, -state["tokens"] * interval)
+            return wait + max(0, state["blocked_until"] - now)
+
+    def block(self, host, seconds):
+        with self.lock:
+            state = self.hosts.setdefault(host, {"tokens": 0, "updated": time.monotonic(), "blocked_until": 0})
+            state["blocked_until"] = max(state["blocked_until"], time.monotonic() + seconds)
+
+def retry_after_seconds(headers):
+    """Seconds from a Retry-After header (delta or HTTP date), or None."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return int(value)
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return None
+
+host_throttle = HostThrottle()
+
+def crawl_delay_for(url, agent):
+    """Crawl-delay from an already cached robots.txt; never triggers a fetch."""
+    hit, rp = robots_cache.lookup(robots_host(url))
+    if not hit or rp is None:
+        return None
+    return rp.crawl_delay(agent) or rp.crawl_delay("*")
+
+def pace_request(url, agent):
+    """Reserve a slot for url's host and return the seconds to wait for it."""
+    return host_throttle.reserve(robots_host(url), crawl_delay_for(url, agent))
+
+def note_response(url, response):
+    """Back off a host that answered 429/503 with Retry-After."""
+    if response.status_code in (429, 503):
+        seconds = retry_after_seconds(response.headers)
+        if seconds:
+            logger.warning(f"{robots_host(url)} asked us to retry after {seconds:.0f}s")
+            host_throttle.block(robots_host(url), seconds)
+
+def rate_limited_request(url, headers=None, stream=False):
+    """Make a GET request paced per host, with random User-Agent and timeout."""
     headers = headers or {}
     headers['User-Agent'] = get_random_user_agent()
-    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    delay = pace_request(url, headers['User-Agent'])
+    if delay:
+        time.sleep(delay)  # Respectful scraping
+    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream)
+    note_response(url, response)
     return response
 
-def check_robots_allowed(url):
-    """Checks robots.txt and ensures scraping is allowed for the target URL."""
-    parsed = urlparse(url)
-    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-    agent = get_random_user_agent()
+def robots_max_age(headers, default=ROBOTS_TTL):
+    """How long a robots.txt response may be reused, honouring Cache-Control."""
+    for directive in headers.get("Cache-Control", "").lower().split(","):
+        directive = directive.strip()
+        if directive in ("no-store", "no-cache"):
+            return 0
+        if directive.startswith("max-age="):
+            try:
+                return max(int(directive.split("=", 1)[1]), 0)
+            except ValueError:
+                pass
+    return default
+
+def parse_robots(robots_url, status_code, content):
+    """Build a RobotFileParser from a robots.txt response, or None to allow everything."""
+    if status_code != 200:
+        logger.warning(f"robots.txt fetch failed ({status_code}): {robots_url}")
+        return None  # Fail open
+
+    if not content.strip():
+        logger.warning(f"robots.txt is empty for {robots_url}")
+        return None
 
-    try:
-        # Manually fetch robots.txt to follow redirects
-        r = requests.get(robots_url, timeout=REQUEST_TIMEOUT)
-        if r.status_code != 200:
-            logger.warning(f"robots.txt fetch failed ({r.status_code}): {robots_url}")
-            return True  # Fail open
-
-        content = r.text
-        if not content.strip():
-            logger.warning(f"robots.txt is empty for {robots_url}")
-            return True
-
-        rp = RobotFileParser()
-        rp.parse(content.splitlines())
-        allowed = rp.can_fetch(agent, url)
-        logger.debug(f"robots.txt allowed for agent '{agent}' on {url}: {allowed}")
-        return allowed
-
-    except Exception as e:
-        logger.warning(f"Could not process robots.txt for {url}: {e}")
-        return True  # Fail open
-
-def check_robots_allowed_override(url):
-    # Reddit blocks all bots; override for browser-like headers
-    parsed = urlparse(url)
-    if "reddit.com" in parsed.netloc:
-        return True
-    return check_robots_allowed(url)
-ALWAYS_ALLOW_DOMAINS = {"www.espn.com", "feeds.bbci.co.uk"}
+    rp = RobotFileParser()
+    rp.parse(content.splitlines())
+    return rp
 
-def check_robots_allowed_override_sports(url):
-    from urllib.parse import urlparse
-    from urllib.robotparser import RobotFileParser
+class RobotsCache:
+    """Parsed robots.txt per scheme://host, each kept until its own expiry."""
 
-    parsed = urlparse(url)
-    if parsed.netloc in ALWAYS_ALLOW_DOMAINS:
-        return True
+    def __init__(self):
+        self.entries = {}  # host -> (parser or None, expires_at)
+        self.locks = {}
+        self.guard = threading.Lock()
 
-    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-    rp = RobotFileParser()
-    rp.set_url(robots_url)
+    def lookup(self, host):
+        """Return (hit, parser); a None parser means everything is allowed."""
+        entry = self.entries.get(host)
+        if entry and entry[1] > time.monotonic():
+            return True, entry[0]
+        return False, None
 
-    try:
-        rp.read()
-        return rp.can_fetch("*", url)
-    except Exception:
-        logger.warning(f"robots.txt fetch failed: {robots_url} — assuming allowed")
+    def store(self, host, parser, max_age):
+        if max_age > 0:
+            self.entries[host] = (parser, time.monotonic() + max_age)
+
+    def lock_for(self, host):
+        with self.guard:
+            return self.locks.setdefault(host, threading.Lock())
+
+robots_cache = RobotsCache()
+
+def robots_host(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def get_robots_parser(url):
+    """Cached robots.txt parser for url's host; one fetch per host at a time."""
+    host = robots_host(url)
+    hit, rp = robots_cache.lookup(host)
+    if hit:
+        return rp
+
+    with robots_cache.lock_for(host):
+        # Another thread may have fetched it while we waited
+        hit, rp = robots_cache.lookup(host)
+        if hit:
+            return rp
+
+        robots_url = f"{host}/robots.txt"
+        try:
+            r = session.get(robots_url, headers={"User-Agent": get_random_user_agent()}, timeout=REQUEST_TIMEOUT)
+            rp = parse_robots(robots_url, r.status_code, r.text)
+            robots_cache.store(host, rp, robots_max_age(r.headers))
+        except Exception as e:
+            logger.warning(f"Could not process robots.txt for {url}: {e}")
+            rp = None  # Fail open
+            robots_cache.store(host, rp, ROBOTS_ERROR_TTL)
+        return rp
+
+def check_robots_allowed(url, agent=None):
+    """Checks robots.txt and ensures scraping is allowed for the target URL."""
+    agent = agent or get_random_user_agent()
+    rp = get_robots_parser(url)
+    if rp is None:
         return True
 
+    allowed = rp.can_fetch(agent, url)
+    logger.debug(f"robots.txt allowed for agent '{agent}' on {url}: {allowed}")
+    return allowed
 
 def validate_url(url: str, allowed_domains: list) -> str:
     """Ensure the URL is valid and from an allowed domain."""
@@ -115,88 +295,183 @@ def validate_url(url: str, allowed_domains: list) -> str:
         raise ValueError(f"Domain not allowed: {parsed.netloc}")
     return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
 
-def safe_fetch(func):
-    """Wrap a fetcher with try/catch and logging."""
-    def wrapper(*args, **kwargs):
-        try:
-            result = func(*args, **kwargs)
-            logger.info(f"{func.__name__} succeeded with {len(result)} items")
-            return result
-        except (Timeout, TooManyRedirects, RequestException) as e:
-            logger.warning(f"{func.__name__} network error: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"{func.__name__} failed: {e}")
-            return []
-    return wrapper
-
+def check_size(r):
+    if int(r.headers.get("Content-Length") or 0) > MAX_CONTENT_LENGTH:
+        raise ValueError("Response too large")
 
+def read_capped(r, limit=MAX_CONTENT_LENGTH):
+    """Read a streamed response body, giving up as soon as it passes limit bytes.
+
+    Covers chunked and lying responses that a Content-Length check misses;
+    the cap applies after decompression.
+    """
+    check_size(r)
+    body = bytearray()
+    for chunk in r.iter_content(chunk_size=READ_CHUNK_SIZE):
+        body += chunk
+        if len(body) > limit:
+            raise ValueError("Response too large")
+    return bytes(body)
+
+def conditional_get(url, parse, headers=None):
+    """GET url with stored validators and parse it, reusing the last parse on a 304."""
+    headers = dict(headers or {})
+    headers.update(feed_validators.headers_for(url))
+
+    r = rate_limited_request(url, headers=headers, stream=True)
+    try:
+        if r.status_code == 304:
+            logger.info(f"{url} not modified, reusing previous entries")
+            return feed_validators.headlines_for(url)
 
-import feedparser
+        r.raise_for_status()
+        body = read_capped(r)
+    finally:
+        r.close()
 
-@safe_fetch
-@cached(google_cache)
-def fetch_google_news(source="google"):
-    rss_url = "https://news.google.com/rss"
-    headlines = []
+    headlines = parse(body)
+    feed_validators.remember(url, r.headers, headlines)
+    return headlines
 
-    try:
-        feed = feedparser.parse(rss_url)
+def parse_rss_headlines(content, source, allowed_domains=None, limit=10):
+    """Turn an RSS/Atom document into headline dicts, dropping off-domain links."""
+    feed = feedparser.parse(content)
 
-        for entry in feed.entries:
+    headlines = []
+    for entry in feed.entries:
+        try:
+            link = entry.link
+            if allowed_domains is not None:
+                link = validate_url(link, allowed_domains)
             headlines.append({
                 "title": entry.title,
-                "link": entry.link,
-                "source": "Google News"
+                "link": link,
+                "source": source
             })
+        except Exception as e:
+            logger.warning(f"Error parsing {source} RSS item: {e}")
 
-    except Exception as e:
-        logger.warning(f"Google News RSS fetch failed: {e}")
-
-    return headlines[:10]
-
-
-@safe_fetch
-@cached(reddit_cache)
-def fetch_reddit_news(source="reddit"):
-    rss_url = "https://www.reddit.com/r/news/.rss"
-    allowed_domains = ["www.reddit.com"]
-
-    if not check_robots_allowed_override(rss_url):
-      logger.warning("Scraping not allowed by robots.txt")
-      return []
-
+    return headlines[:limit]
 
-    # Custom headers since Reddit blocks generic user-agents
-    headers = {
-        "User-Agent": get_random_user_agent()
-    }
+# Precompiled once; matches the first link inside the row's titleline span
+HN_TITLELINE_LINK = etree.XPath(
+    './/span[contains(concat(" ", normalize-space(@class), " "), " titleline ")]/a[1]'
+)
 
-    r = rate_limited_request(rss_url, headers=headers)
+def parse_hackernews(html, limit=10, encoding="utf-8"):
+    """Extract front-page stories from a Hacker News HTML page.
 
-    if int(r.headers.get("Content-Length") or 0) > MAX_CONTENT_LENGTH:
-        raise ValueError("Response too large")
+    Streams the page through lxml's HTML iterparse and stops as soon as
+    limit story rows are found, instead of building a BeautifulSoup tree.
+    HN declares its charset only in the HTTP header, hence the explicit encoding.
+    """
+    headlines = []
+    rows = etree.iterparse(io.BytesIO(html), events=("end",), tag="tr", html=True, recover=True, encoding=encoding)
+    try:
+        for _, row in rows:
+            if "athing" not in (row.get("class") or "").split():
+                continue
+            try:
+                links = HN_TITLELINE_LINK(row)
+                if not links:
+                    continue
+
+                title = "".join(links[0].itertext()).strip()
+                link = links[0].get("href")
+                if link.startswith("item?id="):
+                    link = f"https://news.ycombinator.com/{link}"
+
+                headlines.append({
+                    "title": title,
+                    "link": link,
+                    "source": "Hacker News"
+                })
+            except Exception as e:
+                logger.warning(f"Error parsing Hacker News item: {e}")
+
+            if len(headlines) >= limit:
+                break
+    except etree.XMLSyntaxError as e:
+        # Empty or truncated page; keep whatever rows parsed cleanly
+        logger.warning(f"Hacker News page did not parse: {e}")
 
-    r.raise_for_status()
+    return headlines
 
-    # Parse RSS feed using feedparser
-    import feedparser
-    feed = feedparser.parse(r.text)
+def parse_hackernews_soup(html, limit=10):
+    """BeautifulSoup version of parse_hackernews, kept as the benchmark baseline."""
+    soup = BeautifulSoup(html, "lxml")
 
+    # Each post row is a 'tr.athing' with a title in the sibling row's 'titleline' span
     headlines = []
-    for entry in feed.entries:
+    for item in soup.select("tr.athing"):
         try:
-            title = entry.title
-            link = validate_url(entry.link, allowed_domains)
+            titleline = item.select_one(".titleline a")
+            if not titleline:
+                continue
+
+            title = titleline.get_text(strip=True)
+            link = titleline['href']
+            if link.startswith("item?id="):
+                link = f"https://news.ycombinator.com/{link}"
+
             headlines.append({
                 "title": title,
                 "link": link,
-                "source": "Reddit News"
+                "source": "Hacker News"
             })
         except Exception as e:
-            logger.warning(f"Error parsing Reddit RSS item: {e}")
+            logger.warning(f"Error parsing Hacker News item: {e}")
+
+    return headlines[:limit]
+
+def safe_fetch(func):
+    """Wrap a fetcher with try/catch and logging."""
+    def wrapper(*args, **kwargs):
+        try:
+            result = func(*args, **kwargs)
+            logger.info(f"{func.__name__} succeeded with {len(result)} items")
+            return result
+        except (Timeout, TooManyRedirects, RequestException) as e:
+            logger.warning(f"{func.__name__} network error: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"{func.__name__} failed: {e}")
+            return []
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+# --- Source Fetchers ---
+PARSERS = {
+    "rss": lambda body, source: parse_rss_headlines(body, source.label, source.allowed_domains, source.max_items),
+    "hackernews": lambda body, source: parse_hackernews(body, source.max_items),
+}
+
+def parse_source(source, body):
+    """Parse a downloaded body with the source's parser and tag its headlines."""
+    headlines = PARSERS[source.parser](body, source)
+    for h in headlines:
+        h["weight"] = source.weight
+    return headlines
+
+def make_fetcher(source):
+    """Build the cached, error-safe fetcher for one registry Source."""
+    def fetch():
+        if source.robots and not check_robots_allowed(source.url):
+            logger.warning(f"Scraping not allowed by robots.txt: {source.url}")
+            return []
+        return conditional_get(source.url, lambda body: parse_source(source, body))
+
+    fetch.__name__ = fetch.__qualname__ = f"fetch_{source.name}"
+    return safe_fetch(cached(TTLCache(maxsize=1, ttl=source.ttl))(fetch))
+
+FETCHERS = {source.name: make_fetcher(source) for source in SOURCES}
 
-    return headlines[:10]
+fetch_google_news = FETCHERS["google_news"]
+fetch_reddit_news = FETCHERS["reddit_news"]
+fetch_hackernews = FETCHERS["hackernews"]
+fetch_ycombinator = FETCHERS["ycombinator"]
+fetch_yahoo_finance_news = FETCHERS["yahoo_finance_news"]
+fetch_espn_news = FETCHERS["espn_news"]
 '''
 @safe_fetch
 @cached(cache)
@@ -224,47 +499,6 @@ def fetch_reddit_news():
         })
     return headlines
 '''
-
-@safe_fetch
-@cached(hn_cache)
-def fetch_hackernews(source="hn"):
-    url = "https://news.ycombinator.com/"
-
-    if not check_robots_allowed(url):
-        logger.warning("Scraping not allowed by robots.txt")
-        return []
-
-    r = rate_limited_request(url)
-
-    if int(r.headers.get("Content-Length") or 0) > MAX_CONTENT_LENGTH:
-        raise ValueError("Response too large")
-
-    r.raise_for_status()
-
-    soup = BeautifulSoup(r.text, "lxml")
-
-    # Each post row is a 'tr.athing' with a title in the sibling row's 'titleline' span
-    headlines = []
-    for item in soup.select("tr.athing"):
-        try:
-            titleline = item.select_one(".titleline a")
-            if not titleline:
-                continue
-
-            title = titleline.get_text(strip=True)
-            link = titleline['href']
-            if link.startswith("item?id="):
-                link = f"https://news.ycombinator.com/{link}"
-
-            headlines.append({
-                "title": title,
-                "link": link,
-                "source": "Hacker News"
-            })
-        except Exception as e:
-            logger.warning(f"Error parsing Hacker News item: {e}")
-
-    return headlines[:10]
 '''
 @safe_fetch
 @cached(cache)
@@ -300,45 +534,6 @@ def fetch_hackernews():
 '''
 
 
-@safe_fetch
-@cached(ycomb_cache)
-def fetch_ycombinator(source="ycomb"):
-    rss_url = "https://www.ycombinator.com/blog/rss/"
-    allowed_domains = ["www.ycombinator.com"]
-
-    # Y Combinator's RSS feed is public and intended for bots
-    headers = {
-        "User-Agent": get_random_user_agent()
-    }
-
-    r = rate_limited_request(rss_url, headers=headers)
-
-    if int(r.headers.get("Content-Length") or 0) > MAX_CONTENT_LENGTH:
-        raise ValueError("Response too large")
-
-    r.raise_for_status()
-
-    import feedparser
-    feed = feedparser.parse(r.text)
-
-    headlines = []
-    for entry in feed.entries:
-        try:
-            title = entry.title
-            link = validate_url(entry.link, allowed_domains)
-            headlines.append({
-                "title": title,
-                "link": link,
-                "source": "YC Blog"
-            })
-        except Exception as e:
-            logger.warning(f"Error parsing YC Blog RSS item: {e}")
-
-    return headlines[:10]
-
-
-
-
 @safe_fetch
 @cached(cache)
 def fetch_twitter_trending(source="twitter"):
@@ -346,96 +541,9 @@ def fetch_twitter_trending(source="twitter"):
     return [{"title": "#MockTrend", "link": "https://twitter.com", "source": "Twitter"}]
 
 
-@safe_fetch
-@cached(yahoo_cache)  # You need to define this cache like reddit_cache
-def fetch_yahoo_finance_news(feed_url="https://finance.yahoo.com/news/rssindex", source="yahoo"):
-    allowed_domains = ["finance.yahoo.com", "feeds.finance.yahoo.com","finance.yahoo.com",
-    "www.barrons.com",
-    "www.investors.com"]
-
-    if not check_robots_allowed(feed_url):
-        logger.warning("Scraping not allowed by robots.txt")
-        return []
-
-    headers = {
-        "User-Agent": get_random_user_agent()
-    }
-
-    r = rate_limited_request(feed_url, headers=headers)
-
-    if int(r.headers.get("Content-Length") or 0) > MAX_CONTENT_LENGTH:
-        raise ValueError("Response too large")
-
-    r.raise_for_status()
-
-    import feedparser
-    feed = feedparser.parse(r.text)
-
-    headlines = []
-    for entry in feed.entries:
-        try:
-            title = entry.title
-            link = validate_url(entry.link, allowed_domains)
-            headlines.append({
-                "title": title,
-                "link": link,
-                "source": source
-            })
-        except Exception as e:
-            logger.warning(f"Error parsing Yahoo RSS item: {e}")
-
-    return headlines[:10]
-
-@safe_fetch
-@cached(espn_cache)  # Define a TTLCache for this
-def fetch_espn_news(feed_url="https://www.espn.com/espn/rss/news", source="ESPN"):
-    allowed_domains = ["www.espn.com", "feeds.bbci.co.uk", "www.skysports.com", "www.cbssports.com", "www.foxsports.com", "www.wsj.com"]
-
-    if not check_robots_allowed_override_sports(feed_url):
-        logger.warning(f"Scraping not allowed by robots.txt: {feed_url}")
-        return []
-
-    headers = {
-        "User-Agent": get_random_user_agent()
-    }
-
-    r = rate_limited_request(feed_url, headers=headers)
-
-    if int(r.headers.get("Content-Length") or 0) > MAX_CONTENT_LENGTH:
-        raise ValueError("Response too large")
-
-    r.raise_for_status()
-
-    import feedparser
-    feed = feedparser.parse(r.text)
-
-    headlines = []
-    for entry in feed.entries:
-        try:
-            title = entry.title
-            link = validate_url(entry.link, allowed_domains)
-            headlines.append({
-                "title": title,
-                "link": link,
-                "source": source
-            })
-        except Exception as e:
-            logger.warning(f"Error parsing Sports RSS item: {e}")
-
-    return headlines[:10]
-
-
 # Dev trigger for testing
 if __name__ == "__main__":
-    for func in [
-        fetch_google_news,
-        fetch_reddit_news,
-        fetch_hackernews,
-        fetch_ycombinator,
-        fetch_yahoo_finance_news,
-        fetch_espn_news,
-        fetch_twitter_trending
-    ]:
+    for func in [*FETCHERS.values(), fetch_twitter_trending]:
         headlines = func()
         print(f"{func.__name__}: {len(headlines)} headlines fetched.")
         
@@ -0,0 +1,132 @@
+# seen_stories.py - Cross-cycle memory of stories already scored and classified
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+SEEN_TTL = 48 * 3600  # Forget a story this long after it was last scraped
+SEEN_MAX_ENTRIES = 50_000
+SEEN_STORE_PATH = os.getenv("SEEN_STORIES_PATH", "seen_stories.json")
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {"oc", "fbclid", "gclid", "ref_src"}  # Plus every utm_* parameter
+
+def normalize_link(link):
+    """Scheme-less, lowercase host + path without fragment, trailing slash or tracking params.
+
+    The rest of the query stays, sorted: it often is the story's identity,
+    as in news.ycombinator.com/item?id=N.
+    """
+    parsed = urlparse(link or "")
+    if not parsed.netloc:
+        return None
+    host = parsed.netloc.lower().removeprefix("www.")
+    params = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    )
+    query = f"?{urlencode(params)}" if params else ""
+    return f"{host}{parsed.path.rstrip('/')}{query}"
+
+def title_words(title):
+    """A title's casefolded words, in any script.
+
+    Letters, digits and combining marks (Devanagari vowel signs, for one)
+    make up words; everything else separates them.
+    """
+    text = (title or "").casefold()
+    return "".join(ch if unicodedata.category(ch)[0] in "LNM" else " " for ch in text).split()
+
+def title_fingerprint(title):
+    """Stable short hash of a title's words, or of the stripped title if it has none."""
+    key = " ".join(title_words(title)) or (title or "").strip()
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+class SeenStories:
+    """Bounded, time-evicted index of stories from earlier scrape cycles.
+
+    A story is known if either its normalized link or its title fingerprint
+    was seen before. Records carry the text-only score and category, so a
+    known story only needs its engagement terms recomputed.
+    """
+
+    def __init__(self, path=None, ttl=SEEN_TTL, max_entries=SEEN_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stories = OrderedDict()  # fingerprint -> record, least recently seen first
+        self.aliases = {}  # normalized link -> fingerprint
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.stories)
+
+    def lookup(self, headline):
+        """The stored record for a headline, or None if it is new."""
+        fingerprint = title_fingerprint(headline.get("title"))
+        record = self.stories.get(fingerprint)
+        if record is None:
+            fingerprint = self.aliases.get(normalize_link(headline.get("link")))
+            record = self.stories.get(fingerprint)
+        return record
+
+    def remember(self, headline, base_score, category, now=None):
+        """Record a story as seen now, keeping its original first_seen."""
+        now = now or time.time()
+        fingerprint = title_fingerprint(headline.get("title"))
+        link = normalize_link(headline.get("link"))
+        with self.lock:
+            if fingerprint not in self.stories and link in self.aliases:
+                # A retitled story keeps the record its link already points at
+                fingerprint = self.aliases[link]
+            record = self.stories.pop(fingerprint, None) or {"first_seen": now, "link": link}
+            record.update(base_score=base_score, category=category, last_seen=now)
+            self.stories[fingerprint] = record
+            if link:
+                self.aliases[link] = fingerprint
+            self.evict(now)
+        return record
+
+    def evict(self, now=None):
+        """Drop stories past their TTL, then the oldest ones over max_entries."""
+        now = now or time.time()
+        while self.stories:
+            fingerprint, record = next(iter(self.stories.items()))
+            if record["last_seen"] > now - self.ttl and len(self.stories) <= self.max_entries:
+                break
+            del self.stories[fingerprint]
+            if self.aliases.get(record.get("link")) == fingerprint:
+                del self.aliases[record["link"]]
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stories = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load seen stories from {self.path}: {e}")
+            return
+        with self.lock:
+            self.stories = OrderedDict(sorted(stories.items(), key=lambda item: item[1]["last_seen"]))
+            self.aliases = {r["link"]: fp for fp, r in self.stories.items() if r.get("link")}
+            self.evict()
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            snapshot = json.dumps(self.stories)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+
+seen_stories = SeenStories(SEEN_STORE_PATH)
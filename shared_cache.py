@@ -0,0 +1,111 @@
+# shared_cache.py - One scraper per host, with its headlines shared by every worker
+#
+# Under `uvicorn --workers N` each process runs the app's lifespan. The first
+# to take SCRAPER_LOCK_PATH scrapes and writes every cycle's /trending JSON to
+# SHARED_SNAPSHOT_PATH; the others only read that file. The lock dies with
+# its process, so a reader takes over if the scraper goes away. A reader
+# asked to clear the cache leaves a marker file that the scraper picks up.
+
+import logging
+import os
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows): every process scrapes for itself
+    fcntl = None
+
+SCRAPER_LOCK_PATH = os.getenv("SCRAPER_LOCK_PATH", "scraper.lock")
+SHARED_SNAPSHOT_PATH = os.getenv("SHARED_SNAPSHOT_PATH", "trending_snapshot.json")
+SHARED_POLL_INTERVAL = 5  # Seconds between a reader's snapshot checks
+
+logger = logging.getLogger(__name__)
+
+class ScraperLock:
+    """Non-blocking exclusive flock; whoever holds it is the scraper."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    @property
+    def held(self):
+        return self.fd is not None
+
+    def try_acquire(self):
+        if self.fd is not None:
+            return True
+        if fcntl is None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+
+class SharedSnapshot:
+    """The latest /trending body, replaced atomically and re-read only when it changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.clear_path = f"{path}.clear"  # Present while a reader's /admin/clear_cache is pending
+        self.version = None  # (inode, mtime_ns, size) of the last file read or written
+
+    @property
+    def modified_at(self):
+        """Wall-clock time the last snapshot read or written was published."""
+        return self.version[1] / 1e9 if self.version else None
+
+    def write(self, body):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, self.path)
+        self.version = self.stat()
+
+    def stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def read_if_changed(self):
+        """The snapshot bytes if the file was replaced since last time, else None."""
+        version = self.stat()
+        if version is None or version == self.version:
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                body = f.read()
+        except OSError as e:
+            logger.warning(f"Could not read shared snapshot {self.path}: {e}")
+            return None
+        self.version = version
+        return body
+
+    def request_clear(self):
+        """Ask the scraping worker to drop its headlines; readers cannot reach its memory."""
+        with open(self.clear_path, "wb"):
+            pass
+
+    def take_clear_request(self):
+        """True, once, if a clear was requested since the last call."""
+        try:
+            os.remove(self.clear_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+scraper_lock = ScraperLock(SCRAPER_LOCK_PATH)
+shared_snapshot = SharedSnapshot(SHARED_SNAPSHOT_PATH)
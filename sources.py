@@ -0,0 +1,86 @@
+# sources.py - Declarative registry of the feeds Pulse scrapes
+#
+# Adding a feed means adding a Source here (or to the JSON file named by
+# PULSE_SOURCES_FILE); the generic fetchers in scraper.py / async_scraper.py
+# handle fetching, robots.txt and parsing for every entry, and
+# poll_scheduler.py decides when the app polls each one.
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+@dataclass(frozen=True)
+class Source:
+    name: str                                   # Registry key; the fetcher is called fetch_<name>
+    label: str                                  # Shown as the headline's "source"
+    url: str
+    parser: str = "rss"                         # Key into scraper.PARSERS
+    allowed_domains: Optional[Tuple[str, ...]] = None  # None skips link validation
+    ttl: int = 300                              # Starting poll interval in seconds; poll_scheduler adapts it
+                                                # (the blocking scraper.py reuses a fetch this long)
+    max_items: int = 10
+    weight: float = 1.0                         # Multiplier applied to each headline's score
+    robots: bool = True                         # Check robots.txt before fetching
+
+SOURCES = [
+    Source(
+        name="google_news",
+        label="Google News",
+        url="https://news.google.com/rss",
+        robots=False,
+    ),
+    Source(
+        name="reddit_news",
+        label="Reddit News",
+        url="https://www.reddit.com/r/news/.rss",
+        allowed_domains=("www.reddit.com",),
+        ttl=600,
+        robots=False,  # Reddit blocks all bots; we fetch with browser-like headers
+    ),
+    Source(
+        name="hackernews",
+        label="Hacker News",
+        url="https://news.ycombinator.com/",
+        parser="hackernews",
+    ),
+    Source(
+        name="ycombinator",
+        label="YC Blog",
+        url="https://www.ycombinator.com/blog/rss/",
+        allowed_domains=("www.ycombinator.com",),
+        ttl=1200,
+        robots=False,  # Y Combinator's RSS feed is public and intended for bots
+    ),
+    Source(
+        name="yahoo_finance_news",
+        label="yahoo",
+        url="https://finance.yahoo.com/news/rssindex",
+        allowed_domains=("finance.yahoo.com", "feeds.finance.yahoo.com", "www.barrons.com", "www.investors.com"),
+        ttl=1200,
+    ),
+    Source(
+        name="espn_news",
+        label="ESPN",
+        url="https://www.espn.com/espn/rss/news",
+        allowed_domains=("www.espn.com", "feeds.bbci.co.uk", "www.skysports.com", "www.cbssports.com", "www.foxsports.com", "www.wsj.com"),
+        ttl=1200,
+        robots=False,  # ESPN's RSS feeds are published for syndication
+    ),
+]
+
+def load_sources(path):
+    """Read extra Source entries from a JSON list of objects."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    sources = []
+    for entry in entries:
+        if entry.get("allowed_domains") is not None:
+            entry["allowed_domains"] = tuple(entry["allowed_domains"])
+        sources.append(Source(**entry))
+    return sources
+
+if os.getenv("PULSE_SOURCES_FILE"):
+    SOURCES = SOURCES + load_sources(os.environ["PULSE_SOURCES_FILE"])
+
+SOURCES_BY_NAME = {source.name: source for source in SOURCES}
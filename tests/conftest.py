@@ -0,0 +1,17 @@
+# Tests import the flat root modules directly and keep every state file
+# (seen stories, feed validators, snapshot, lock, history) in a temp dir.
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_state_dir = tempfile.mkdtemp(prefix="pulse-tests-")
+for _var, _name in (
+    ("SEEN_STORIES_PATH", "seen_stories.json"),
+    ("FEED_VALIDATOR_PATH", "feed_validators.json"),
+    ("HEADLINE_DB_PATH", "headlines.db"),
+    ("SCRAPER_LOCK_PATH", "scraper.lock"),
+    ("SHARED_SNAPSHOT_PATH", "trending_snapshot.json"),
+):
+    os.environ.setdefault(_var, os.path.join(_state_dir, _name))
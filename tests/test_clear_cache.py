@@ -0,0 +1,19 @@
+import asyncio
+
+import app
+
+
+def test_clear_during_ranking_drops_that_publish(monkeypatch):
+    app.publish_headlines([])
+    headline = {"title": "Story from before the clear", "link": "https://example.com/a", "source": "Test",
+                "score": 5.0, "category": "General", "timestamp": "2026-01-01T00:00:00"}
+    monkeypatch.setattr(app.poll_scheduler, "headlines", lambda: [headline])
+
+    def rank_while_cleared(headlines):
+        app.clear_count += 1  # As if /admin/clear_cache ran while this batch was being ranked
+        return headlines
+
+    monkeypatch.setattr(app, "rank_headlines", rank_while_cleared)
+    asyncio.run(app.publish_sources())
+    assert app.cached_headlines == []
+    assert app.trending_payload.body == b"[]"
@@ -0,0 +1,24 @@
+from agent import deduplicate_headlines
+from features import TextFeatures
+
+
+def test_refetched_copies_count_as_one_document():
+    features = TextFeatures()
+    batch = [{"title": "Rocket lands on Mars today"}, {"title": "Markets rally after rate cut"}]
+    features.tfidf(batch)
+    idf = features.idf()
+
+    # Every poll hands over fresh dicts for the same stories
+    features.tfidf([{"title": h["title"]} for h in batch])
+    assert features.documents == 2
+    assert (features.idf() == idf).all()
+
+
+def test_distinct_non_latin_titles_survive_dedup():
+    headlines = [
+        {"title": "मोदी ने संसद में नया बजट पेश किया"},
+        {"title": "भारत ने क्रिकेट विश्व कप जीता"},
+        {"title": "中国经济增长放缓"},
+        {"title": "Markets rally after surprise rate cut"},
+    ]
+    assert deduplicate_headlines(headlines) == headlines
@@ -0,0 +1,28 @@
+import sqlite3
+
+from headline_store import HeadlineStore
+
+NON_LATIN = ["मोदी ने संसद में कहा", "मादी ने संसद में कहा", "中国经济增长放缓"]
+
+
+def test_non_latin_headlines_keep_their_own_rows(tmp_path):
+    store = HeadlineStore(str(tmp_path / "headlines.db"))
+    store.upsert([{"title": t, "link": f"https://example.com/{i}", "score": 1} for i, t in enumerate(NON_LATIN)])
+    store.upsert([{"title": NON_LATIN[0], "score": 5}])
+    assert sorted(row[0] for row in store.iter_rows()) == sorted(NON_LATIN)
+    store.close()
+
+
+def test_old_keys_are_migrated(tmp_path):
+    path = str(tmp_path / "headlines.db")
+    store = HeadlineStore(path)
+    store.upsert([{"title": NON_LATIN[0], "score": 1}])
+    store.close()
+    with sqlite3.connect(path) as conn:  # As written before the fingerprint kept non-Latin words
+        conn.execute("UPDATE headlines SET title_key = 'e4a6a0577479b2b4'")
+        conn.execute("PRAGMA user_version = 0")
+
+    store = HeadlineStore(path)
+    store.upsert([{"title": NON_LATIN[0], "score": 2}, {"title": NON_LATIN[2], "score": 3}])
+    assert len(store) == 2
+    store.close()
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+import async_scraper
+import notifications
+from notifications import Notifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from fake_onesignal import FakeOneSignal  # noqa: E402
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(notifications, "NOTIFY_BACKOFF", 0.01)
+    server = FakeOneSignal()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_notifier(server, scenario):
+    """Run scenario(notifier) against server, then wait for the queue to empty."""
+    async def main():
+        async_scraper.open_client()
+        notifier = Notifier(url=server.url, api_key="test")
+        notifier.start()
+        try:
+            await scenario(notifier)
+            deadline = time.monotonic() + 10
+            while (notifier.queue.qsize() or notifier.pending) and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+        finally:
+            await notifier.stop()
+            await async_scraper.close_client()
+        return notifier
+
+    server.start()
+    return asyncio.run(main())
+
+
+def story(score, title=None):
+    return {"title": title or f"Story scoring {score}", "link": "https://example.com", "score": score}
+
+
+def test_retries_until_accepted(server):
+    server.fail_first = 2
+
+    async def scenario(notifier):
+        notifier.enqueue(story(30))
+
+    notifier = run_notifier(server, scenario)
+    assert server.attempts == 3
+    assert [p["contents"]["en"] for p in server.received] == ["Story scoring 30"]
+    assert (notifier.sent, notifier.failed) == (1, 0)
+
+
+def test_gives_up_after_max_attempts(server):
+    server.fail_first = notifications.NOTIFY_MAX_ATTEMPTS
+
+    async def scenario(notifier):
+        notifier.enqueue(story(30))
+
+    notifier = run_notifier(server, scenario)
+    assert server.attempts == notifications.NOTIFY_MAX_ATTEMPTS
+    assert (notifier.sent, notifier.failed) == (0, 1)
+
+
+def test_honours_retry_after(server):
+    server.fail_first, server.retry_after = 1, 1
+
+    async def scenario(notifier):
+        notifier.enqueue(story(30))
+
+    run_notifier(server, scenario)
+    first, second = server.attempt_times
+    assert second - first >= 0.9  # NOTIFY_BACKOFF alone would retry within 10 ms
+
+
+def test_coalesces_queued_alerts(server):
+    async def scenario(notifier):
+        # Enqueued before the worker first runs, so it drains all three at once
+        for score in (21, 35, 28):
+            notifier.enqueue(story(score))
+
+    run_notifier(server, scenario)
+    assert [p["contents"]["en"] for p in server.received] == ["Story scoring 35"]
+
+
+def test_story_in_flight_is_not_pushed_twice(server):
+    server.delay = 0.3
+    accepted = []
+
+    async def scenario(notifier):
+        notifier.enqueue(story(30))
+        await asyncio.sleep(0.1)  # The worker is now waiting on the slow push
+        accepted.append(notifier.enqueue(story(30)))
+
+    run_notifier(server, scenario)
+    assert accepted == [False]
+    assert server.attempts == 1
+
+
+def test_disabled_without_api_key():
+    async def main():
+        notifier = Notifier(url="http://127.0.0.1:9/unused", api_key=None)
+        notifier.start()
+        return notifier.enqueue(story(30)), notifier.worker
+
+    assert asyncio.run(main()) == (False, None)
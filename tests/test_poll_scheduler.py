@@ -0,0 +1,116 @@
+import pytest
+
+import poll_scheduler
+from poll_scheduler import POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, PollScheduler, SourceSchedule
+
+
+async def no_fetch():
+    return []
+
+
+def stories(*numbers):
+    return [{"title": f"Story number {n}"} for n in numbers]
+
+
+def schedule(interval):
+    return SourceSchedule("test", no_fetch, interval)
+
+
+def test_first_poll_counts_everything_and_keeps_interval():
+    s = schedule(600)
+    assert s.record_success(stories(1, 2, 3), now=1000) == 3
+    assert s.rate is None
+    assert s.interval == 600
+    assert s.next_due == 1600
+
+
+def test_rate_is_smoothed_across_polls():
+    s = schedule(600)
+    s.record_success(stories(1, 2, 3), now=0)
+    assert s.record_success(stories(*range(4, 10)), now=600) == 6
+    assert s.rate == pytest.approx(6 / 600)
+    assert s.interval == pytest.approx(3 / (6 / 600))  # 300s finds POLL_TARGET_NEW
+
+    s.record_success(stories(*range(4, 10)), now=900)  # Nothing new
+    assert s.rate == pytest.approx(0.7 * 6 / 600)
+    assert s.interval == pytest.approx(3 / (0.7 * 6 / 600))
+    assert s.next_due == pytest.approx(900 + s.interval)
+
+
+def test_quiet_source_interval_at_most_doubles():
+    s = schedule(100)
+    s.record_success(stories(1), now=0)
+    for now, interval in ((100, 200), (300, 400), (700, 800)):
+        s.record_success(stories(1), now=now)
+        assert s.interval == interval
+
+
+def test_interval_is_clamped():
+    busy = schedule(600)
+    busy.record_success(stories(1), now=0)
+    busy.record_success(stories(*range(2, 500)), now=60)
+    assert busy.interval == POLL_MIN_INTERVAL
+
+    quiet = schedule(3000)
+    quiet.record_success(stories(1), now=0)
+    quiet.record_success(stories(1), now=3000)
+    assert quiet.interval == POLL_MAX_INTERVAL
+
+    assert schedule(5).interval == POLL_MIN_INTERVAL
+    assert schedule(86400).interval == POLL_MAX_INTERVAL
+
+
+def test_failures_back_off_exponentially_with_jitter(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(poll_scheduler.random, "uniform", lambda a, b: bounds.append((a, b)) or b)
+    s = schedule(600)
+    for _ in range(9):
+        s.record_failure(now=1000)
+    assert bounds == [(d / 2, d) for d in (30, 60, 120, 240, 480, 960, 1920, 3600, 3600)]
+    assert s.next_due == 1000 + POLL_MAX_INTERVAL
+    assert s.interval == 600  # Failures leave the interval and rate alone
+
+
+def test_failure_delay_stays_within_jitter_range():
+    s = schedule(600)
+    s.record_failure(now=0)
+    assert 15 <= s.next_due <= 30
+    s.record_failure(now=0)
+    assert 30 <= s.next_due <= 60
+
+
+def test_success_resets_backoff(monkeypatch):
+    monkeypatch.setattr(poll_scheduler.random, "uniform", lambda a, b: b)
+    s = schedule(600)
+    s.record_success(stories(1), now=0)
+    s.record_failure(now=600)
+    s.record_failure(now=630)
+    s.record_success(stories(1), now=700)
+    assert s.errors == 0
+    assert s.headlines == stories(1)
+    s.record_failure(now=2000)
+    assert s.next_due == 2000 + 30
+
+
+def test_clear_republishes_quiet_sources_on_next_poll():
+    scheduler = PollScheduler()
+    scheduler.add("quiet", no_fetch, 600)
+    schedule = scheduler.schedules["quiet"]
+    schedule.record_success(stories(1, 2), now=1000)
+    assert schedule.record_success(stories(1, 2), now=1600) == 0
+
+    scheduler.clear()
+    assert scheduler.headlines() == []
+    assert scheduler.due(now=1601) == [schedule]
+    assert schedule.record_success(stories(1, 2), now=1601) == 2
+    assert len(scheduler.headlines()) == 2
+
+
+def test_clear_keeps_error_backoff():
+    scheduler = PollScheduler()
+    scheduler.add("broken", no_fetch, 600)
+    schedule = scheduler.schedules["broken"]
+    schedule.record_failure(now=1000)
+    retry_at = schedule.next_due
+    scheduler.clear()
+    assert schedule.next_due == retry_at
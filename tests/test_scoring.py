@@ -0,0 +1,51 @@
+import csv
+import os
+import random
+
+import pytest
+
+import agent
+from agent import score_headline, score_headlines_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def csv_titles():
+    with open(os.path.join(ROOT, "headlines.csv"), encoding="utf-8") as f:
+        return [row[0] for row in csv.reader(f) if row]
+
+
+def random_count(rng):
+    return rng.choice([
+        None, 0, rng.randint(1, 60), rng.randint(-500, -1), rng.randint(0, 10**9),
+        rng.uniform(0, 5000), rng.randint(0, 10**18),
+    ])
+
+
+def random_title(rng, titles):
+    vocabulary = agent.keywords + agent.important_entities + ["the", "a", "?", "", "x" * 40, "BREAKING", "Ünïcode"]
+    if rng.random() < 0.5:
+        return rng.choice(titles)
+    words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 12))]
+    return rng.choice([" ", "", "-"]).join(words) + rng.choice(["", "?", " ?", "?!"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar(seed):
+    """Property: any batch, with any mix of engagement data, scores like score_headline."""
+    rng = random.Random(seed)
+    titles = csv_titles()
+    for _ in range(100):
+        n = rng.randint(0, 40)
+        batch_titles = [random_title(rng, titles) for _ in range(n)]
+        columns = [None if rng.random() < 0.2 else [random_count(rng) for _ in range(n)] for _ in range(3)]
+        expected = [
+            score_headline(t, *(column[i] if column is not None else None for column in columns))
+            for i, t in enumerate(batch_titles)
+        ]
+        assert score_headlines_batch(batch_titles, *columns).tolist() == expected
+
+
+def test_keyword_points_count_each_term_once():
+    points = agent.keyword_matcher.keyword_points_batch(["AI ai AI", "", "breaking: elon and musk", "nothing"])
+    assert points.tolist() == [5, 0, 20, 0]
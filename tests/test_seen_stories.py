@@ -0,0 +1,34 @@
+from seen_stories import SeenStories, normalize_link, title_fingerprint
+
+
+def test_query_identifies_the_story():
+    first = normalize_link("https://news.ycombinator.com/item?id=1")
+    second = normalize_link("https://news.ycombinator.com/item?id=2")
+    assert first != second
+
+
+def test_tracking_params_and_fragment_are_dropped():
+    plain = normalize_link("https://www.example.com/story/")
+    assert normalize_link("https://example.com/story?utm_source=x&utm_medium=y#top") == plain
+    assert normalize_link("https://news.google.com/rss/articles/abc?oc=5") == "news.google.com/rss/articles/abc"
+
+
+def test_hacker_news_self_posts_are_separate_stories():
+    seen = SeenStories()
+    seen.remember({"title": "Ask HN: First question", "link": "https://news.ycombinator.com/item?id=1"}, 3, "Tech")
+    second = {"title": "Show HN: Something else", "link": "https://news.ycombinator.com/item?id=2"}
+    assert seen.lookup(second) is None
+    seen.remember(second, 7, "General")
+    assert len(seen) == 2
+
+
+def test_fingerprint_keeps_non_latin_words():
+    titles = ["मोदी ने संसद में कहा", "मादी ने संसद में कहा", "中国经济增长放缓", "日本经济增长放缓", "", "!!!"]
+    assert len({title_fingerprint(t) for t in titles}) == len(titles)
+    assert title_fingerprint("Café Owners Rally!") == title_fingerprint("café owners rally")
+
+
+def test_unrelated_non_latin_story_is_not_known():
+    seen = SeenStories()
+    seen.remember({"title": "मोदी ने संसद में कहा", "link": "https://example.in/a"}, 4, "Politics")
+    assert seen.lookup({"title": "中国经济增长放缓", "link": "https://example.cn/b"}) is None
@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+CATEGORIES = ["Tech", "Sports", "World"]
+SOURCES = ["Hacker News", "ESPN"]
+
+
+def headline(i):
+    return {
+        "title": f"Headline {i}", "link": f"https://example.com/{i}", "source": SOURCES[i % 2],
+        "score": float(100 - i), "category": CATEGORIES[i % 3], "timestamp": "2026-01-01T00:00:00",
+    }
+
+
+HEADLINES = [headline(i) for i in range(30)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app.limiter, "enabled", False)
+    app.publish_headlines(HEADLINES)
+    yield TestClient(app.app)  # No lifespan: nothing scrapes
+    app.publish_headlines([])
+
+
+def titles(response):
+    return [h["title"] for h in response.json()]
+
+
+def expected(category=None, source=None, min_score=None):
+    return [
+        h["title"] for h in HEADLINES
+        if (category is None or h["category"].lower() == category.lower())
+        and (source is None or h["source"].lower() == source.lower())
+        and (min_score is None or h["score"] >= min_score)
+    ]
+
+
+@pytest.mark.parametrize("category, source, min_score", [
+    (None, None, 85), (None, None, 84.5), (None, None, 1000), (None, None, -1),
+    ("tech", None, 90), (None, "espn", None), ("SPORTS", "Hacker News", 80), ("nope", None, None),
+])
+def test_trending_page_matches_a_scan(client, category, source, min_score):
+    page, next_position = app.trending_page(app.trending_payload, category, source, min_score)
+    assert [app.trending_payload.keys[p][0] for p in page] == expected(category, source, min_score)
+    assert next_position is None
+
+
+def test_cursor_walks_every_page_once(client):
+    seen, cursor = [], None
+    while True:
+        params = {"category": "world", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/trending", params=params)
+        assert response.status_code == 200
+        seen += titles(response)
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert seen == expected(category="world")
+
+
+def test_last_page_has_no_cursor(client):
+    response = client.get("/trending", params={"min_score": 98, "limit": 3})
+    assert titles(response) == ["Headline 0", "Headline 1", "Headline 2"]
+    assert "x-next-cursor" not in response.headers
+
+
+def test_stale_cursor_is_gone(client):
+    cursor = client.get("/trending", params={"limit": 5}).headers["x-next-cursor"]
+    app.publish_headlines(HEADLINES[1:])  # A new cycle changes the ETag generation
+    assert client.get("/trending", params={"limit": 5, "cursor": cursor}).status_code == 410
+
+
+def test_malformed_cursor_is_gone(client):
+    assert client.get("/trending", params={"cursor": "garbage"}).status_code == 410
+
+
+def test_filtered_pages_have_their_own_etags(client):
+    full = client.get("/trending")
+    first = client.get("/trending", params={"limit": 5})
+    other = client.get("/trending", params={"limit": 5, "source": "espn"})
+    etags = {full.headers["etag"], first.headers["etag"], other.headers["etag"]}
+    assert len(etags) == 3
+
+    again = client.get("/trending", params={"limit": 5}, headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+    assert client.get("/trending", params={"limit": 5},
+                      headers={"If-None-Match": other.headers["etag"]}).status_code == 200
@@ -0,0 +1,21 @@
+import pytest
+
+from app import accepts_gzip
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ("gzip", True),
+    ("br, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("*;q=0, gzip", True),
+    ("gzip, *;q=0", True),
+    ("gzip;q=0, *", False),
+    ("identity", False),
+    ("gzip;q=bogus", False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
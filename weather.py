@@ -1,4 +1,20 @@
+import asyncio
+import logging
+
 import requests
+from cachetools import TTLCache
+
+import async_scraper
+from metrics import record_cache
+
+WEATHER_URL = "https://wttr.in/{lat:.4f},{lon:.4f}?format=j1"
+WEATHER_TTL = 600  # Seconds a cell's conditions are reused
+WEATHER_ERROR_TTL = 60  # Seconds a failed cell waits before wttr.in is asked again
+WEATHER_TIMEOUT = 5
+GEOHASH_PRECISION = 5  # ~4.9 x 4.9 km cells
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+logger = logging.getLogger(__name__)
 
 def get_location():
     try:
@@ -30,3 +46,85 @@ def get_weather_data(location):
     except Exception as e:
         print(f"[Weather Error] {e}")
         return None
+
+# --- Cached async lookups for /weather ---
+def geohash(lat, lon, precision=GEOHASH_PRECISION):
+    """Standard base32 geohash of a point."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    cell, bits, value, even = [], 0, 0, True
+    while len(cell) < precision:
+        interval, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            cell.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(cell)
+
+def geohash_center(cell):
+    """(lat, lon) at the middle of a geohash cell."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+weather_cache = TTLCache(maxsize=10_000, ttl=WEATHER_TTL)  # cell -> summary
+weather_failures = TTLCache(maxsize=10_000, ttl=WEATHER_ERROR_TTL)  # cells that just failed
+weather_inflight = {}  # cell -> task fetching its conditions
+
+async def fetch_cell_weather(cell):
+    lat, lon = geohash_center(cell)
+    try:
+        r = await async_scraper.client.get(WEATHER_URL.format(lat=lat, lon=lon), timeout=WEATHER_TIMEOUT)
+        r.raise_for_status()
+        data = r.json()
+
+        current = data["current_condition"][0]
+        summary = {
+            "location": data["nearest_area"][0]["areaName"][0]["value"],
+            "temperature": current["temp_C"],
+            "condition": current["weatherDesc"][0]["value"],
+        }
+    except Exception as e:
+        logger.warning(f"Could not fetch weather for cell {cell}: {e}")
+        weather_failures[cell] = True
+        return None
+    weather_cache[cell] = summary
+    return summary
+
+async def get_cell_weather(lat, lon):
+    """Conditions for the geohash cell around (lat, lon), or None if wttr.in failed.
+
+    Everyone in a cell shares one cached answer; concurrent misses share
+    one upstream request.
+    """
+    cell = geohash(lat, lon)
+    summary = weather_cache.get(cell)
+    hit = summary is not None or cell in weather_failures
+    record_cache("weather", hit)
+    if hit:
+        return summary
+
+    task = weather_inflight.get(cell)
+    if task is None:
+        task = asyncio.ensure_future(fetch_cell_weather(cell))
+        weather_inflight[cell] = task
+        task.add_done_callback(lambda _: weather_inflight.pop(cell, None))
+    # Shielded so one client disconnecting doesn't cancel the others' fetch
+    return await asyncio.shield(task)